@@ -7,6 +7,7 @@ import threading
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from app import bootstrap
 from app.core import EM
 from app.handler import ApplicationStartupEvent
 
@@ -29,6 +30,7 @@ class App(ABC):
         return cls._instance
 
     def startup(self):  # noqa
+        bootstrap()
         EM.emit(ApplicationStartupEvent())
 
     @abstractmethod
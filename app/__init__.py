@@ -2,9 +2,39 @@
 # @author: licanglong
 # @date: 2025/9/24 14:04
 import importlib
-import pkgutil
+import sys
+from typing import Tuple
 
-from app import handler
+# handler 清单模块，打包时由 hooks/hook-app.handler.py 生成
+HANDLER_MANIFEST = "app.handler._manifest"
 
-for finder, name, ispkg in pkgutil.iter_modules(handler.__path__, handler.__name__ + "."):
-    importlib.import_module(name)
+_bootstrapped = False
+
+
+def _handler_modules() -> Tuple[str, ...]:
+    """
+    获取需要加载的 handler 模块
+    - 打包环境优先使用构建时生成的清单，避免启动时扫描目录
+    - 开发环境（或清单不存在时）扫描 app/handler 目录，新增 handler 无需登记
+    """
+    if getattr(sys, "frozen", False):
+        try:
+            return importlib.import_module(HANDLER_MANIFEST).MODULES
+        except ImportError:
+            pass
+    import pkgutil
+    from app import handler
+    return tuple(name for _, name, _ in pkgutil.iter_modules(handler.__path__, handler.__name__ + ".")
+                 if name != HANDLER_MANIFEST)
+
+
+def bootstrap():
+    """
+    加载所有 handler 模块（注册事件订阅、配置解析器等），由应用入口在启动前显式调用，重复调用无副作用
+    """
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    for name in _handler_modules():
+        importlib.import_module(name)
+    _bootstrapped = True
@@ -6,6 +6,5 @@ from app.core.context import CTX
 from app.core.events import EventBusInstance, Event, EventBus, Subscriber, EM
 from app.core.logs import ColorConsoleFormatter
 from app.core.property import PropertyDict
-from app.core.property import PropertyDict
 from app.core.thread_context import ThreadContext, ThreadContextData, use_thread_context
 # __all__ = []
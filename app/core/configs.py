@@ -1,20 +1,59 @@
 # @description: 
 # @author: licanglong
 # @date: 2025/12/23 13:52
+import copy
+import json
 import logging
+import os
 import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 
-import requests
-import yaml
-
 from app.core.events import Event, EM
 from app.core.property import PropertyDict
 
 CONFIG_IMPORT = "config.imports"
+_CONFIG_IMPORT_PATH = tuple(CONFIG_IMPORT.split("."))
+# 设置该环境变量后跳过配置文件的 JSON 缓存
+CONFIG_NOCACHE_ENV = "APP_CONFIG_NOCACHE"
+# 远程配置请求超时（连接, 读取），单位秒
+HTTP_TIMEOUT = (3, 10)
 _log = logging.getLogger(__name__)
 
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _load_yaml(stream):
+    """
+    解析 YAML 内容
+    yaml 在首次加载配置时才导入，优先使用 libyaml 的 C 实现
+    """
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _get_http_session():
+    """
+    获取共享的 requests.Session（连接池 + 失败重试），首次加载远程配置时创建
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                      max_retries=Retry(total=3, backoff_factor=0.2))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
 
 class ConfigEnvironment(PropertyDict):
 
@@ -32,6 +71,7 @@ class ConfigEnvironment(PropertyDict):
             ImportResolver.add_imports(imports)
 
         self.merge(data)
+        EM.emit(ConfigUpdateEvent(source=source))
 
     def extract_imports(self, data: dict) -> list:
         """
@@ -40,23 +80,26 @@ class ConfigEnvironment(PropertyDict):
         """
         if not isinstance(data, dict):
             return []
-        data_config = PropertyDict(data)
-        return data_config.getprop(CONFIG_IMPORT, [])
+        # 直接按预拆分的路径取值，不构造临时 PropertyDict
+        current = data
+        for part in _CONFIG_IMPORT_PATH:
+            if not isinstance(current, dict):
+                return []
+            current = current.get(part)
+        return [] if current is None else current
+
+
+# 模块导入时创建唯一的 ConfigEnvironment（导入锁保证只执行一次）
+_CONFIG_ENVIRONMENT = ConfigEnvironment()
 
 
 class ConfigEnvironmentInstance:
     """
-    ConfigEnvironment 的单例代理
+    ConfigEnvironment 的单例代理，直接返回模块导入时创建的实例
     """
-    _instance_lock = threading.Lock()
-    _instance: ConfigEnvironment = None
 
     def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = ConfigEnvironment(*args, **kwargs)
-        return cls._instance
+        return _CONFIG_ENVIRONMENT
 
 
 class ConfigDataResource(ABC):
@@ -71,44 +114,78 @@ class ConfigDataLocationResolver(ABC):
         pass
 
 
-class RegisterResolverEvent(Event):
+class ConfigUpdateEvent(Event):
+    """
+    配置更新事件
+    - merge_source 合并配置后触发；原地修改嵌套配置后也应触发，使 getprop 缓存失效
+    """
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+class RegisterResolversEvent(Event):
+    """
+    解析器批量解析事件
+    - protocols: 需要解析缓存 import 的协议列表，订阅方一次遍历缓存即可处理全部协议
+    """
+    __slots__ = ("protocols",)
+
+    def __init__(self, protocols=None, **kwargs):
+        super().__init__(**kwargs)
+        self.protocols: list[str] = list(protocols or ())
+
+
+class RegisterResolverEvent(RegisterResolversEvent):
     """
     注册解析器事件
+    - protocol: 新注册的协议，同时作为 protocols 中唯一的协议
     """
+    __slots__ = ("protocol",)
 
     def __init__(self, protocol, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(protocols=[protocol], **kwargs)
         self.protocol = protocol
 
 
 class ImportResolver:
     resolvers = {}  # protocol -> resolver
-    cached_imports = []  # 未解析的 import 条目
+    cached_imports = deque()  # 未解析的 import 条目
+    # 保护 cached_imports，只在读写缓存条目时持有，加载配置时不持有
+    lock = threading.RLock()
 
     @classmethod
     def register(cls, protocol: str, resolver: ConfigDataLocationResolver):
         """注册解析器"""
-        _log.info(f"Register resolver for protocol: {protocol}")
+        _log.info("Register resolver for protocol: %s", protocol)
         cls.resolvers[protocol] = resolver
         EM.emit(RegisterResolverEvent(protocol))
 
     @classmethod
     def add_imports(cls, imports: list[str]):
-        """添加新的 import 条目到缓存"""
-        cls.cached_imports.extend(imports)
-        for protocol in cls.resolvers.keys():
-            EM.emit(RegisterResolverEvent(protocol))
+        """
+        添加新的 import 条目到缓存，并对其中已注册的协议触发一次解析事件
+        解析导入的文件时其自身的 import 同样在此立即解析，保证任意层级的被导入配置都先于导入方合并（导入方优先）
+        """
+        # YAML 中的 import 条目可能被写成数字等非字符串值，直接忽略，不中断配置加载
+        imports = [imp for imp in imports if isinstance(imp, str)]
+        protocols = {imp.split(":", 1)[0] for imp in imports if ":" in imp}
+        protocols.intersection_update(cls.resolvers)
+        with cls.lock:
+            cls.cached_imports.extend(imports)
+        if protocols:
+            EM.emit(RegisterResolversEvent(protocols=protocols))
 
     @classmethod
     def resolve(cls, import_str: str):
-        if ":" not in import_str:
-            cls.cached_imports.append(import_str)
+        protocol, sep, target = import_str.partition(":")
+        resolver = cls.resolvers.get(protocol) if sep else None
+        if resolver is None:
+            # 无法解析的条目放回缓存，与其他对 cached_imports 的读写一样在锁内进行
+            with cls.lock:
+                cls.cached_imports.append(import_str)
             return None
-        protocol, target = import_str.split(":", 1)
-        if protocol not in cls.resolvers:
-            cls.cached_imports.append(import_str)
-            return None
-        resolver = cls.resolvers[protocol]
         return resolver.resolve(target.strip())
 
 
@@ -117,13 +194,62 @@ class FileResource(ConfigDataResource):
         self.path = Path(path)
 
     def load(self) -> dict:
-        if not self.path.exists():
+        try:
+            src_stat = self.path.stat()
+        except FileNotFoundError:
             return {}
-        with open(self.path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        # if isinstance(data, dict) and "config" in data and isinstance(data["config"], dict):
-        #     return data["config"]
-        return data
+        use_cache = not os.getenv(CONFIG_NOCACHE_ENV)
+        # 文件未变化（路径、修改时间、大小相同）时直接复用进程内的解析结果
+        data = _load_file_cached(str(self.path), src_stat.st_mtime_ns, src_stat.st_size, use_cache)
+        return copy.deepcopy(data)
+
+    @staticmethod
+    def _write_cache(cache_path: Path, data, mtime_ns: int, size: int):
+        """
+        将解析结果连同源文件的修改时间、大小写入 JSON 缓存文件（先写临时文件再原子替换）
+        无法无损转换为 JSON 的数据（如 datetime、非字符串 key）不写缓存
+        """
+        try:
+            text = json.dumps({"mtime_ns": mtime_ns, "size": size, "data": data}, ensure_ascii=False)
+            if json.loads(text)["data"] != data:
+                return
+        except (TypeError, ValueError):
+            return
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            _log.debug("write config cache failed: %s: %s", cache_path, e)
+            tmp_path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=64)
+def _load_file_cached(path: str, mtime_ns: int, size: int, use_cache: bool):
+    """
+    解析配置文件，结果按 (路径, 修改时间, 大小) 缓存在进程内
+    use_cache 为 True 时优先读取 JSON 缓存文件，解析 YAML 后回写
+    缓存文件中记录了生成时源文件的修改时间与大小，两者完全相同才使用，
+    源文件被还原为更早的修改时间（cp -p、解压、git 回滚）时同样判定为失效
+    """
+    path = Path(path)
+    cache_path = path.with_suffix(path.suffix + ".cache.json")
+    if use_cache:
+        try:
+            cached = json.loads(cache_path.read_bytes())
+            if (isinstance(cached, dict) and cached.get("mtime_ns") == mtime_ns
+                    and cached.get("size") == size and "data" in cached):
+                return cached["data"]
+        except (OSError, ValueError):
+            # 缓存不存在或已损坏，回退到解析 YAML
+            pass
+    with open(path, "r", encoding="utf-8") as f:
+        data = _load_yaml(f) or {}
+    # if isinstance(data, dict) and "config" in data and isinstance(data["config"], dict):
+    #     return data["config"]
+    if use_cache:
+        FileResource._write_cache(cache_path, data, mtime_ns, size)
+    return data
 
 
 class FileResolver(ConfigDataLocationResolver):
@@ -132,16 +258,34 @@ class FileResolver(ConfigDataLocationResolver):
 
 
 class HttpResource(ConfigDataResource):
+    # url -> (ETag, Last-Modified, 解析结果)，用于条件请求
+    _response_cache = {}
+
     def __init__(self, url: str):
         self.url = url
 
     def load(self) -> dict:
-        resp = requests.get(self.url)
-        resp.raise_for_status()
-        import yaml
-        data = yaml.safe_load(resp.text) or {}
+        headers = {}
+        cached = self._response_cache.get(self.url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        with _get_http_session().get(self.url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as resp:
+            if resp.status_code == 304 and cached:
+                # 配置未变化，直接复用上次的解析结果
+                return copy.deepcopy(cached[2])
+            resp.raise_for_status()
+            # 直接从响应流解析，不先解码成完整字符串；decode_content 处理 gzip 等压缩
+            resp.raw.decode_content = True
+            data = _load_yaml(resp.raw) or {}
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
         if isinstance(data, dict) and "config" in data and isinstance(data["config"], dict):
-            return data["config"]
+            data = data["config"]
+        if etag or last_modified:
+            self._response_cache[self.url] = (etag, last_modified, copy.deepcopy(data))
         return data
 
 
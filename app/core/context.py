@@ -1,24 +1,19 @@
 # @description: 
 # @author: licanglong
 # @date: 2025/12/23 13:49
-import threading
 from typing import Optional
 
 from app.core.configs import ConfigEnvironmentInstance
 
 
 class AppContext:
-    _instance_lock = threading.Lock()
+    # 唯一实例，模块导入时创建
     _instance: Optional["AppContext"] = None
 
     DEFAULT_CONFIG_FILE = "env/env.yml"
     DEFAULT_LOG_FILE = "logs/app.log"
 
     def __new__(cls):
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
@@ -29,4 +24,6 @@ class AppContext:
         self._initialized = True
 
 
+# 模块导入时创建唯一实例（导入锁保证只执行一次），之后 AppContext() 直接返回该实例
+AppContext._instance = object.__new__(AppContext)
 CTX = AppContext()
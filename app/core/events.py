@@ -1,22 +1,34 @@
 # @description: 
 # @author: licanglong
 # @date: 2025/11/20 11:46
+import atexit
+import bisect
+import heapq
+import itertools
 import logging
+import queue
 import threading
 import time
-from collections import defaultdict
-from typing import Any, Dict, Type, List, Callable, Optional
+from typing import Any, Dict, Type, List, Callable, Optional, Tuple
 
 _log = logging.getLogger(__name__)
 
 
 class Event:
     """事件基类，支持携带任意数据"""
+    # 子类未声明 __slots__ 时仍有 __dict__，可自由添加属性
+    __slots__ = ("source", "tags", "timestamp")
 
     def __init__(self, source: Any = None, tags: Optional[List[str]] = None):
         self.source = source
         self.tags = tags or []
-        self.timestamp = time.time()
+        # 单调时钟（纳秒），用于计算耗时，不受系统时间调整影响
+        self.timestamp = time.monotonic_ns()
+
+    @property
+    def wall_time(self) -> float:
+        """事件创建时的系统时间（秒），由单调时间戳按需换算"""
+        return time.time() - (time.monotonic_ns() - self.timestamp) / 1e9
 
 
 class Subscriber:
@@ -25,6 +37,7 @@ class Subscriber:
     # 订阅者信息
     # ---------------------------
     """
+    __slots__ = ("callback", "event_type", "condition", "priority", "async_", "once")
 
     def __init__(self, callback: Callable, event_type: Type[Event],
                  condition: Optional[Callable[[Event], bool]] = None,
@@ -38,6 +51,78 @@ class Subscriber:
         self.async_ = async_
         self.once = once
 
+    def __lt__(self, other: "Subscriber") -> bool:
+        # 优先级高的排在前面，供 bisect/heapq 直接比较
+        return self.priority > other.priority
+
+
+class _AsyncWorkerPool:
+    """
+    异步订阅者的执行线程池
+    - 工作线程为守护线程，与逐个创建守护线程时一致，不会阻止进程退出
+    - 有空闲线程时复用，没有时新建线程，耗时的回调不会阻塞后续异步分发
+    - 线程空闲超过 idle_timeout 秒后退出
+    """
+
+    def __init__(self, thread_name_prefix: str = "evt", idle_timeout: float = 60.0):
+        self._thread_name_prefix = thread_name_prefix
+        self._idle_timeout = idle_timeout
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._threads = set()
+        # 正在等待任务且未被预定的线程数
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, fn: Callable, *args):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit after close")
+            self._queue.put((fn, args))
+            if self._idle:
+                # 预定一个空闲线程处理该任务
+                self._idle -= 1
+                return
+            thread = threading.Thread(target=self._worker, daemon=True,
+                                      name=f"{self._thread_name_prefix}_{next(self._counter)}")
+            self._threads.add(thread)
+        thread.start()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _worker(self):
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._idle_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        # 仍有未被预定的空闲线程时退出一个；否则说明已被预定，继续等待任务
+                        if self._idle:
+                            self._idle -= 1
+                            return
+                    continue
+                if item is None:
+                    return
+                fn, args = item
+                fn(*args)
+                with self._lock:
+                    if self._closed:
+                        return
+                    self._idle += 1
+        finally:
+            with self._lock:
+                self._threads.discard(threading.current_thread())
+
 
 class EventBus:
     """
@@ -47,9 +132,14 @@ class EventBus:
     """
 
     def __init__(self):
-        # 事件类型 -> list[Subscriber]
-        self._subscribers: Dict[Type[Event], List[Subscriber]] = defaultdict(list)
-        self._lock = threading.RLock()
+        # 事件类型 -> tuple[Subscriber]，写时复制：订阅变化时整体替换字典，emit 读取时无需加锁
+        self._subscribers: Dict[Type[Event], Tuple[Subscriber, ...]] = {}
+        # 事件类型 -> 适用的订阅者（含父类订阅，已按优先级排序），订阅变化时清空
+        self._dispatch_cache: Dict[Type[Event], Tuple[Subscriber, ...]] = {}
+        # 仅写路径（订阅/注销/清理/计算分发缓存）加锁
+        self._write_lock = threading.Lock()
+        # 异步订阅者共用的线程池，首次异步分发时创建
+        self._async_pool: Optional[_AsyncWorkerPool] = None
 
     def subscribe(self, event_type: Type[Event], *,
                   condition: Optional[Callable[[Event], bool]] = None,
@@ -70,10 +160,12 @@ class EventBus:
 
         def decorator(func: Callable):
             sub = Subscriber(func, event_type, condition, priority, async_, once)
-            with self._lock:
-                self._subscribers[event_type].append(sub)
-                # 按优先级排序，优先级高先执行
-                self._subscribers[event_type].sort(key=lambda s: -s.priority)
+            with self._write_lock:
+                subs = list(self._subscribers.get(event_type, ()))
+                # 二分插入保持按优先级有序，优先级高先执行，同优先级按订阅顺序
+                bisect.insort(subs, sub)
+                self._subscribers = {**self._subscribers, event_type: tuple(subs)}
+                self._dispatch_cache = {}
             return func
 
         return decorator
@@ -87,10 +179,19 @@ class EventBus:
         :param callback: 回调
         :return:
         """
-        with self._lock:
-            self._subscribers[event_type] = [
-                s for s in self._subscribers[event_type] if s.callback != callback
-            ]
+        with self._write_lock:
+            existing = self._subscribers.get(event_type)
+            if not existing:
+                return
+            subs = tuple(s for s in existing if s.callback != callback)
+            if len(subs) == len(existing):
+                return
+            # 没有剩余订阅者时移除该事件类型，分发时不再对其做 issubclass 判断
+            subscribers = {k: v for k, v in self._subscribers.items() if k is not event_type}
+            if subs:
+                subscribers[event_type] = subs
+            self._subscribers = subscribers
+            self._dispatch_cache = {}
 
     def emit(self, event: Event):
         """
@@ -102,24 +203,21 @@ class EventBus:
         """
         event_type = type(event)
         subscribers_to_remove = []
-        with self._lock:
-            # 支持子类事件触发父类订阅
-            applicable_subs = []
-            for etype, subs in self._subscribers.items():
-                if issubclass(event_type, etype):
-                    applicable_subs.extend(subs)
+        applicable_subs = self._dispatch_cache.get(event_type)
+        if applicable_subs is None:
+            applicable_subs = self._resolve_subscribers(event_type)
 
         # 执行回调
-        for sub in sorted(applicable_subs, key=lambda s: -s.priority):
+        for sub in applicable_subs:
             if sub.condition and not sub.condition(event):
                 continue
             try:
                 if sub.async_:
-                    threading.Thread(target=sub.callback, args=(event,), daemon=True).start()
+                    self._get_async_pool().submit(self._run_async, sub, event)
                 else:
                     sub.callback(event)
             except Exception as e:
-                _log.error(f"[EventBus] error in subscriber {sub.callback}: {e}")
+                _log.error("[EventBus] error in subscriber %s: %s", sub.callback, e)
             if sub.once:
                 subscribers_to_remove.append(sub)
 
@@ -135,26 +233,68 @@ class EventBus:
         :param event_type:
         :return:
         """
-        with self._lock:
+        with self._write_lock:
             if event_type:
-                self._subscribers[event_type] = []
+                self._subscribers = {k: v for k, v in self._subscribers.items() if k is not event_type}
             else:
-                self._subscribers.clear()
+                self._subscribers = {}
+            self._dispatch_cache = {}
+
+    def close(self, wait: bool = True):
+        """
+        # -----------------------
+        # 关闭异步线程池
+        # -----------------------
+        :param wait: 是否等待正在执行的回调完成
+        :return:
+        """
+        with self._write_lock:
+            pool, self._async_pool = self._async_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _get_async_pool(self) -> _AsyncWorkerPool:
+        pool = self._async_pool
+        if pool is None:
+            with self._write_lock:
+                if self._async_pool is None:
+                    self._async_pool = _AsyncWorkerPool(thread_name_prefix="evt")
+                pool = self._async_pool
+        return pool
+
+    @staticmethod
+    def _run_async(sub: Subscriber, event: Event):
+        try:
+            sub.callback(event)
+        except Exception as e:
+            _log.error("[EventBus] error in async subscriber %s: %s", sub.callback, e)
+
+    def _resolve_subscribers(self, event_type: Type[Event]) -> Tuple[Subscriber, ...]:
+        """
+        计算事件类型适用的订阅者（支持子类事件触发父类订阅），按优先级排序后缓存
+        """
+        with self._write_lock:
+            # 各类型的订阅列表已有序，直接多路归并
+            result = tuple(heapq.merge(*(
+                subs for etype, subs in self._subscribers.items() if issubclass(event_type, etype)
+            )))
+            self._dispatch_cache = {**self._dispatch_cache, event_type: result}
+            return result
+
+
+# 模块导入时创建唯一的 EventBus（导入锁保证只执行一次）
+_EVENT_BUS = EventBus()
+# 退出时不等待异步回调，与守护线程语义一致
+atexit.register(_EVENT_BUS.close, wait=False)
 
 
 class EventBusInstance:
     """
-    EventBus 的单例类
+    EventBus 的单例类，直接返回模块导入时创建的实例
     """
-    _instance_lock = threading.Lock()
-    _instance: Optional[EventBus] = None
 
     def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            with cls._instance_lock:
-                if not cls._instance:
-                    cls._instance = EventBus()
-        return cls._instance
+        return _EVENT_BUS
 
 
 EM = EventBusInstance()
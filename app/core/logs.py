@@ -3,6 +3,13 @@
 # @date: 2025/11/20 11:45
 import logging
 import sys
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def _location(filename: str, func_name: str, lineno: int) -> str:
+    """日志位置信息（补齐到 40 字符），调用点数量有限，按 (文件, 函数, 行号) 缓存"""
+    return ("%s:%s:%d" % (filename, func_name, lineno)).ljust(40)
 
 
 class ColorConsoleFormatter(logging.Formatter):
@@ -32,16 +39,25 @@ class ColorConsoleFormatter(logging.Formatter):
 
     def __init__(self):
         super().__init__(datefmt="%Y-%m-%d %H:%M:%S")
-        # 预创建各级别的 Formatter，避免重复实例化
-        self._formatters = {}
-        for level, formats in self.FORMATS.items():
-            self._formatters[level] = logging.Formatter(formats, style="{", datefmt=self.datefmt)
+        # 各级别的格式模板，format 时直接 format_map，不再经过内部 Formatter 转发
+        self._templates = dict(self.FORMATS)
+        self._default_template = self.FORMATS[logging.INFO]
 
     def format(self, record: logging.LogRecord) -> str:
-        location = f"{record.filename}:{record.funcName}:{record.lineno}"
-        record.location = f"{location:<40}"
-        formatter = self._formatters.get(record.levelno, self._formatters[logging.INFO])
-        return formatter.format(record)
+        record.message = record.getMessage()
+        values = record.__dict__ | {
+            "asctime": self.formatTime(record, self.datefmt),
+            "location": _location(record.filename, record.funcName, record.lineno),
+        }
+        s = self._templates.get(record.levelno, self._default_template).format_map(values)
+        # 异常及调用栈信息的处理与 logging.Formatter.format 一致
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = s + "\n" + record.exc_text
+        if record.stack_info:
+            s = s + "\n" + self.formatStack(record.stack_info)
+        return s
 
 
 custom_stream_handler = logging.StreamHandler()
@@ -2,86 +2,262 @@
 # @author: licanglong
 # @date: 2025/9/29 16:15
 
+import copy
 import threading
-from collections import UserDict
-from typing import Literal
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Literal, Tuple, Union
 
+_MISSING = object()
+_UNCACHED = object()
+# getprop 结果缓存的上限，超过后整体清空，避免动态拼接的 key 无限增长
+_GETPROP_CACHE_SIZE = 1024
+# 所有 PropertyDict 共享的写锁，只用于串行化合并操作，合并很少，无需每个实例单独创建
+_WRITE_LOCK = threading.Lock()
 
-class PropertyDict(UserDict):
+
+@lru_cache(maxsize=1024)
+def _parse_key(key: str, delimiter: str) -> Tuple[str, ...]:
+    """
+    拆分并校验点分路径 key，结果按 (key, delimiter) 缓存
+    key 中出现空片段（如 "a..b"、".a"、"a."）时抛出 ValueError
+    """
+    parts = tuple(p.strip() for p in key.split(delimiter))
+    if not all(parts):
+        raise ValueError(f"Key contains empty segment: '{key}'")
+    return parts
+
+
+def _copy_dict(d: dict) -> dict:
+    """复制待修改的嵌套字典，保留字典子类类型"""
+    return d.copy() if type(d) is dict else copy.copy(d)
+
+
+def _merge_ignore(base: dict, ov: dict, stack: list):
+    """合并一层（none_mode='ignore'）：遇到 None 时跳过；两边均为字典的子树复制后入栈"""
+    if not any(v is None or isinstance(v, dict) for v in ov.values()):
+        # 无嵌套字典且无 None，直接整体覆盖
+        base.update(ov)
+        return
+    base_get = base.get
+    for k, v in ov.items():
+        if v is None:
+            continue
+        if type(v) is dict or isinstance(v, dict):
+            sub = base_get(k)
+            if type(sub) is dict or isinstance(sub, dict):
+                base[k] = sub = _copy_dict(sub)
+                stack.append((sub, v))
+                continue
+        base[k] = v
+
+
+def _merge_delete(base: dict, ov: dict, stack: list):
+    """合并一层（none_mode='delete'）：遇到 None 时删除对应键；两边均为字典的子树复制后入栈"""
+    if not any(v is None or isinstance(v, dict) for v in ov.values()):
+        base.update(ov)
+        return
+    base_get = base.get
+    for k, v in ov.items():
+        if v is None:
+            base.pop(k, None)
+            continue
+        if type(v) is dict or isinstance(v, dict):
+            sub = base_get(k)
+            if type(sub) is dict or isinstance(sub, dict):
+                base[k] = sub = _copy_dict(sub)
+                stack.append((sub, v))
+                continue
+        base[k] = v
+
+
+def _merge_override(base: dict, ov: dict, stack: list):
+    """合并一层（none_mode='override'）：None 直接覆盖；两边均为字典的子树复制后入栈"""
+    if not any(isinstance(v, dict) for v in ov.values()):
+        base.update(ov)
+        return
+    base_get = base.get
+    for k, v in ov.items():
+        if type(v) is dict or isinstance(v, dict):
+            sub = base_get(k)
+            if type(sub) is dict or isinstance(sub, dict):
+                base[k] = sub = _copy_dict(sub)
+                stack.append((sub, v))
+                continue
+        base[k] = v
+
+
+_MERGE_STRATEGIES = {
+    'ignore': _merge_ignore,
+    'delete': _merge_delete,
+    'override': _merge_override,
+}
+
+
+class PropertyDict(dict):
     """
     增强版字典：
-    - 继承自 UserDict，保留原生 dict 功能
+    - 继承自 dict，保留原生 dict 功能及性能
     - 增加 getprop 方法，支持点分路径取值
+    - getprop 的路径取值结果会被缓存，merge 或修改顶层键时失效；
+      原地修改嵌套字典后需调用 invalidate_cache（或触发 ConfigUpdateEvent）
     """
 
     def __init__(self, initial_data=None):
         super().__init__(initial_data or {})
-        self._lock = threading.RLock()
+        # (key, delimiter) -> 取值结果（路径不存在时为 _MISSING）
+        self._getprop_cache = {}
+
+    def __getstate__(self):
+        # 缓存不随复制、序列化传递
+        return {}
+
+    def __setstate__(self, state):
+        self._getprop_cache = {}
+
+    def invalidate_cache(self):
+        """清空 getprop 缓存；整体替换而非 clear，正在读取的线程只会写入已丢弃的旧缓存"""
+        self._getprop_cache = {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._getprop_cache = {}
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._getprop_cache = {}
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._getprop_cache = {}
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._getprop_cache = {}
+
+    def setdefault(self, key, default=None):
+        self._getprop_cache = {}
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._getprop_cache = {}
+        return super().pop(*args)
+
+    def popitem(self):
+        self._getprop_cache = {}
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._getprop_cache = {}
+
+    @property
+    def _write_lock(self):
+        """
+        合并（写）时使用的锁，读取不加锁；进程内只有一个线程时无需加锁
+        """
+        return _WRITE_LOCK if threading.active_count() > 1 else nullcontext()
 
     def merge(self, override: dict, none_mode: Literal['ignore', 'delete', 'override'] = 'ignore'):
         """
-        递归合并 override 到 self.data
+        递归合并 override 到当前字典
+        采用写时复制：被修改的嵌套字典先复制再修改，最后一次性替换顶层的值，
+        已发布的嵌套字典不会被原地修改，读取（getprop）无需加锁
         :param none_mode:
             - 'ignore'  遇到 None 时跳过，不覆盖原值
             - 'delete'  遇到 None 时删除对应键
             - 'override' 默认行为，直接覆盖
         """
 
-        def _merge(base, override):
-            for k, v in override.items():
-                if v is None:
-                    if none_mode == 'ignore':
-                        continue
-                    elif none_mode == 'delete':
-                        base.pop(k, None)
-                        continue
-                    # else 'override'，直接覆盖 None
-
-                if k in base and isinstance(base[k], dict) and isinstance(v, dict):
-                    _merge(base[k], v)
-                else:
-                    base[k] = v
-
-        with self._lock:
-            _merge(self.data, override)
-
-    def getprop(self, key: str, default=None, *, raise_error: bool = False, delimiter: str = "."):
+        merge_level = _MERGE_STRATEGIES.get(none_mode, _merge_override)
+        with self._write_lock:
+            new_data = dict(self)
+            # 用显式栈代替递归，栈中为待合并的 (base, override) 子树，base 均为新复制的字典
+            stack = [(new_data, override)]
+            while stack:
+                base, ov = stack.pop()
+                merge_level(base, ov, stack)
+
+            # 发布合并结果：dict.update 为单次 C 调用，读取方只会看到旧值或新值
+            removed = self.keys() - new_data.keys()
+            dict.update(self, new_data)
+            for k in removed:
+                dict.pop(self, k, None)
+            # 发布后再替换缓存
+            self._getprop_cache = {}
+
+    def getprop(self, key: Union[str, Tuple[str, ...]], default=None, *, raise_error: bool = False,
+                delimiter: str = "."):
         """
         从嵌套字典中获取指定 key 的值。
         - key 支持分隔符路径，例如 "database.host" -> config["database"]["host"]
+        - key 也可以是已拆分好的路径元组，例如 ("database", "host")，不再做拆分
         - 分隔符默认是 '.'，可以通过参数 delimiter 指定
         - 如果路径不存在，或最终值为 None，返回 default
         - 禁止 key 中出现空片段（如 "a..b"、".a"、"a."），一旦出现返回 default
         - raise_error=True 时，如果路径不存在则抛 KeyError
         """
-        if not isinstance(self.data, dict):
-            if raise_error:
-                raise KeyError(f"Config is not a dict, cannot get key '{key}'")
-            return default
-
-        if not isinstance(key, str) or not key:
+        if not key or not isinstance(key, (str, tuple)):
             if raise_error:
                 raise KeyError(f"Invalid key: '{key}'")
             return default
 
-        key_args = [p.strip() for p in key.split(delimiter)]
-        if any(not part for part in key_args):  # 禁止空片段
+        if type(key) is str and delimiter not in key:
+            # 无分隔符的顶层 key 直接取值，不做拆分和遍历
+            part = key.strip()
+            value = self.get(part, _MISSING) if part else _MISSING
+            if value is _MISSING:
+                if raise_error:
+                    raise KeyError(f"Key path not found: '{key}'")
+                return default
+            return default if value is None else value
+
+        cache = self._getprop_cache
+        cache_key = (key, delimiter)
+        value = cache.get(cache_key, _UNCACHED)
+        if value is _UNCACHED:
+            try:
+                value = self._lookup(key, delimiter)
+            except ValueError:  # 禁止空片段
+                if raise_error:
+                    raise KeyError(f"Key contains empty segment: '{key}'")
+                return default
+            if len(cache) >= _GETPROP_CACHE_SIZE:
+                cache.clear()
+            cache[cache_key] = value
+
+        if value is _MISSING:
             if raise_error:
-                raise KeyError(f"Key contains empty segment: '{key}'")
+                raise KeyError(f"Key path not found: '{key}'")
             return default
+        return default if value is None else value
+
+    def _lookup(self, key: Union[str, Tuple[str, ...]], delimiter: str):
+        """
+        按路径遍历取值，路径不存在时返回 _MISSING；key 含空片段时抛出 ValueError
+        """
+        if isinstance(key, tuple):
+            key_args = key
+            if not all(key_args):
+                raise ValueError(key)
+        else:
+            key_args = _parse_key(key, delimiter)
 
-        current = self.data
+        current = self
         for part in key_args:
-            if isinstance(current, dict):
-                if part in current:
-                    current = current[part]
-                else:
-                    if raise_error:
-                        raise KeyError(f"Key path not found: '{key}'")
-                    return default
-            else:
-                if raise_error:
-                    raise KeyError(f"Key path not found: '{key}'")
-                return default
+            # 中间节点绝大多数是普通 dict，先做精确类型比较，再回退到 isinstance 兼容子类
+            if type(current) is dict or isinstance(current, dict):
+                current = current.get(part, _MISSING)
+                if current is not _MISSING:
+                    continue
+            return _MISSING
+        return current
 
-        return default if current is None else current
+    def getmany(self, prefix: str, *, delimiter: str = ".") -> dict:
+        """
+        获取 prefix 路径下的整个子配置，一次遍历即可读取同一前缀下的多个配置项
+        - 路径不存在，或对应值不是字典时返回空字典
+        """
+        value = self.getprop(prefix, delimiter=delimiter)
+        return value if isinstance(value, dict) else {}
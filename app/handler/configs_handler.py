@@ -3,9 +3,12 @@
 # @date: 2025/10/11 10:44
 import logging
 import os
+import shutil
 import sys
+from pathlib import Path
 
-from app.core import ImportResolver, FileResolver, HttpResolver, EM, RegisterResolverEvent
+from app.core import ImportResolver, FileResolver, HttpResolver, EM, RegisterResolversEvent, \
+    ConfigUpdateEvent
 from app.handler.event_handler import ApplicationStartupEvent
 from app.utils.pathutils import getpath
 
@@ -15,27 +18,40 @@ ImportResolver.register("file", FileResolver())
 ImportResolver.register("http", HttpResolver())
 
 
-@EM.subscribe(RegisterResolverEvent, priority=10)
-def on_register_resolver(event: RegisterResolverEvent):
+@EM.subscribe(RegisterResolversEvent, priority=10)
+def on_register_resolver(event: RegisterResolversEvent):
     """
-    注册解析器
+    注册解析器（RegisterResolverEvent 为其子类，同样由此处理）
+    一次遍历缓存的 import，解析所有协议属于 event.protocols 的条目
     """
     from app.core import CTX
-    remaining = []
-    for imp in ImportResolver.cached_imports:
-        if not imp:
-            continue
-        if ":" not in imp:
-            remaining.append(imp)
-            continue
-        pfx, target = imp.split(":", 1)
-        if pfx == event.protocol:
-            resolver = ImportResolver.resolvers[pfx]
-            resource = resolver.resolve(target.strip())
-            CTX.ENV.merge_source(resource)
-        else:
-            remaining.append(imp)
-    ImportResolver.cached_imports = remaining
+    protocols = set(event.protocols)
+    pending = ImportResolver.cached_imports
+    matched = []
+    with ImportResolver.lock:
+        # 只在锁内原地轮转一遍取出待解析条目，未处理的放回队尾
+        for _ in range(len(pending)):
+            imp = pending.popleft()
+            if not imp:
+                continue
+            pfx, sep, target = imp.partition(":")
+            if sep and pfx in protocols:
+                matched.append((pfx, target.strip()))
+            else:
+                pending.append(imp)
+    # 加载及合并配置可能涉及文件、HTTP、Nacos 等阻塞 I/O，在锁外执行，不阻塞其他解析器注册
+    for pfx, target in matched:
+        resource = ImportResolver.resolvers[pfx].resolve(target)
+        CTX.ENV.merge_source(resource)
+
+
+@EM.subscribe(ConfigUpdateEvent, priority=sys.maxsize)
+def on_config_update(event: ConfigUpdateEvent):
+    """
+    配置更新后清空 getprop 缓存，先于其他订阅者执行，保证其读取到最新配置
+    """
+    from app.core import CTX
+    CTX.ENV.invalidate_cache()
 
 
 @EM.subscribe(ApplicationStartupEvent, priority=sys.maxsize - 1)
@@ -45,15 +61,14 @@ def init_config_onstartup(event: ApplicationStartupEvent):
     # 初始配置文件
     config_path = getpath(CTX.DEFAULT_CONFIG_FILE, raise_error=False)
     if not os.path.exists(config_path):
-        _log.warning(f"no config file：{CTX.DEFAULT_CONFIG_FILE}")
+        _log.warning("no config file：%s", CTX.DEFAULT_CONFIG_FILE)
         return
     if getattr(sys, 'frozen', False):
         extract_config_path = os.path.join(os.path.dirname(sys.executable), CTX.DEFAULT_CONFIG_FILE)
         # 如果文件不存在，解压并复制到当前工作目录
         if not os.path.exists(extract_config_path):
-            os.makedirs(os.path.dirname(extract_config_path), exist_ok=True)
-            # 避免权限问题：用二进制读写方式复制
-            with open(config_path, 'rb') as fsrc, open(extract_config_path, 'wb') as fdst:
-                fdst.write(fsrc.read())
+            Path(extract_config_path).parent.mkdir(parents=True, exist_ok=True)
+            # 只复制文件内容，不复制权限信息；Linux 下由内核直接拷贝（sendfile）
+            shutil.copyfile(config_path, extract_config_path)
         config_path = extract_config_path
     CTX.ENV.merge_source(FileResolver().resolve(config_path))
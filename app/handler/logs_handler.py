@@ -1,9 +1,16 @@
 # @description: 
 # @author: licanglong
 # @date: 2025/10/11 11:11
+import atexit
 import logging
 import os
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional
 
 from concurrent_log import ConcurrentTimedRotatingFileHandler
 
@@ -12,22 +19,137 @@ from app.handler.event_handler import ApplicationStartupEvent
 
 _log = logging.getLogger(__name__)
 
-custom_stream_handler = logging.StreamHandler()
-if not getattr(sys, 'frozen', False):  # 开发环境
-    custom_stream_handler.setFormatter(ColorConsoleFormatter())
-# 确保日志路径
-logging.basicConfig(
-    level=logging.INFO,
-    format="{asctime} {levelname:>7} {threadName:^10} [{filename}#{funcName}:{lineno}]: {message}",
-    style="{",
-    encoding='utf-8',
-    handlers=[custom_stream_handler]
-)
+LOG_FORMAT = "{asctime} {levelname:>7} {threadName:^10} [{filename}#{funcName}:{lineno}]: {message}"
+
+# 后台写日志的监听线程，由 init_logger_onstartup 启动
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener():
+    """停止日志监听线程，写完队列中剩余的日志后关闭其 handler"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+class CachedRolloverHandler(ConcurrentTimedRotatingFileHandler):
+    """
+    缓存切割判断所需文件状态的 handler
+    - 未到切割时间时只比较日志创建时间与 rolloverAt，不访问文件系统
+    - 到达切割时间后使用缓存的“是否为普通文件”结果，该结果在创建时计算，每次切割后刷新
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._regular_file = self._check_regular_file()
+
+    def _check_regular_file(self) -> bool:
+        # 与标准库一致：文件不存在或为普通文件时允许切割
+        return not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+
+    def shouldRollover(self, record) -> bool:
+        t = int(record.created if record is not None else time.time())
+        if t < self.rolloverAt:
+            return False
+        if not self._regular_file:
+            # 非普通文件（如 /dev/null）不切割，推迟下一次判断时间
+            self.rolloverAt = self.computeRollover(t)
+            return False
+        return True
+
+    def doRollover(self):
+        super().doRollover()
+        self._regular_file = self._check_regular_file()
+
+
+class BufferedConcurrentTimedRotatingFileHandler(CachedRolloverHandler):
+    """
+    带写缓冲的日志文件 handler
+    - 日志格式化后先放入内存缓冲区，不再每条日志加文件锁写一次
+    - 缓冲区达到 buffer_size 字节或缓存时间超过 flush_interval 秒时，加锁一次写入整个缓冲区
+    - 没有新日志时由定时器在 flush_interval 后刷新，close 时写完剩余内容
+    - 日志跨过切割时间时先写出缓冲区，切割前的日志仍写入切割前的文件
+    - buffer_size <= 0 时退化为逐条写入
+    """
+
+    def __init__(self, filename, *args, buffer_size: int = 64 * 1024, flush_interval: float = 0.2, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffer_len = 0
+        self._buffer_since = 0.0
+        self._last_record = None
+        self._timer: Optional[threading.Timer] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.buffer_size <= 0:
+            super().emit(record)
+            return
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        # 缓冲区中的日志均早于切割时间而本条已到切割时间时，先写出缓冲区，保证每批日志都落在切割点同一侧
+        last = self._last_record
+        if last is not None and int(last.created) < self.rolloverAt <= int(record.created):
+            self.flush()
+        now = time.monotonic()
+        if not self._buffer:
+            self._buffer_since = now
+        self._buffer.append(msg)
+        self._buffer_len += len(msg)
+        self._last_record = record
+        if self._buffer_len >= self.buffer_size or now - self._buffer_since >= self.flush_interval:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                super().flush()
+                return
+            data = "".join(self._buffer)
+            record = self._last_record
+            self._buffer.clear()
+            self._buffer_len = 0
+            self._last_record = None
+            try:
+                with self.concurrent_lock:
+                    if self.shouldRollover(record):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(data)
+                    self.stream.flush()
+            except Exception:
+                self.handleError(record)
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
 
 
 @EM.subscribe(ApplicationStartupEvent, priority=sys.maxsize)
 def init_logger_onstartup(event: ApplicationStartupEvent):
     """加载并初始化配置"""
+    global _listener
     logpath = CTX.ENV.getprop('log.path', CTX.DEFAULT_LOG_FILE)
     custom_stream_handler = logging.StreamHandler()
     if getattr(sys, 'frozen', False):  # 打包后的环境
@@ -35,22 +157,30 @@ def init_logger_onstartup(event: ApplicationStartupEvent):
     else:  # 开发环境
         custom_stream_handler.setFormatter(ColorConsoleFormatter())
         log_path = os.path.join(os.getenv('APP_PATH'), logpath)
-    if not os.path.exists(os.path.dirname(log_path)):
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-    file_handler = ConcurrentTimedRotatingFileHandler(
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    file_handler = BufferedConcurrentTimedRotatingFileHandler(
         filename=log_path,
         when='midnight',  # 每天午夜切割
         backupCount=30,  # 保留最近30天的日志
         encoding='utf-8',
+        buffer_size=int(CTX.ENV.getprop('log.buffer.size', 64 * 1024)),  # 写缓冲大小（字节），0 表示不缓冲
+        flush_interval=int(CTX.ENV.getprop('log.buffer.interval_ms', 200)) / 1000,  # 缓冲最长停留时间
     )
-    _log.info(f"日志文件路径：{log_path}")
-    # 确保日志路径
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, style="{"))
+    if custom_stream_handler.formatter is None:
+        custom_stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, style="{"))
+    _log.info("日志文件路径：%s", log_path)
+    # 业务线程只将日志放入队列，由后台监听线程统一写文件和控制台
+    _stop_listener()
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # 队列中只合并消息内容，完整格式由监听线程中的 handler 负责
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = QueueListener(log_queue, file_handler, custom_stream_handler, respect_handler_level=True)
+    _listener.start()
     logging.basicConfig(
         level=CTX.ENV.getprop('log.level', logging.DEBUG),
-        format="{asctime} {levelname:>7} {threadName:^10} [{filename}#{funcName}:{lineno}]: {message}",
-        style="{",
-        encoding='utf-8',
-        handlers=[file_handler, custom_stream_handler],
+        handlers=[queue_handler],
         force=True
     )
-    _log.info(f"日志级别：{logging.getLevelName(logging.getLogger().level)}")
+    _log.info("日志级别：%s", logging.getLevelName(logging.getLogger().level))
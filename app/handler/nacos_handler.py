@@ -1,19 +1,39 @@
 # @description: 
 # @author: licanglong
 # @date: 2025/9/25 14:26
+import copy
+import json
 import logging
 import threading
-from typing import Callable, Optional, Dict
+from typing import Callable, Optional, Dict, Type, TypeVar
 
 import nacos
+import yaml
+
+try:  # 可选依赖，安装后用于解析 JSON 格式的配置
+    import orjson
+except ImportError:
+    orjson = None
+try:  # 可选依赖，安装后 load_as 可直接将 JSON 配置解码为目标类型
+    import msgspec
+except ImportError:
+    msgspec = None
 
 from app.core import ConfigDataResource, ConfigDataLocationResolver
 from app.handler.event_handler import ApplicationStartupEvent
+from app.utils.typeutils import as_dataclass
 
 log = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# 优先使用 libyaml 的 C 实现
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class NacosClient:
+    __slots__ = ("_client",)
+
     _instance_lock = threading.Lock()
     _instance: Optional["NacosClient"] = None
 
@@ -35,7 +55,7 @@ class NacosClient:
         try:
             return self._client.get_config(data_id, group)
         except Exception as e:
-            log.error(f"获取配置失败 data_id={data_id}, group={group}: {e}")
+            log.error("获取配置失败 data_id=%s, group=%s: %s", data_id, group, e)
             return None
 
     def add_listener(self, data_id: str, group: str, callback: Callable[[dict], None], log_change: bool = True):
@@ -49,13 +69,13 @@ class NacosClient:
 
         def inner_callback(args: dict):
             if log_change:
-                log.info(f"[配置变化] data_id={args.get('data_id')}, 内容={args.get('content')}")
+                log.info("[配置变化] data_id=%s, 内容=%s", args.get('data_id'), args.get('content'))
             callback(args)
 
         try:
             self._client.add_config_watcher(data_id, group, inner_callback)
         except Exception as e:
-            log.error(f"添加配置监听失败 data_id={data_id}, group={group}: {e}")
+            log.error("添加配置监听失败 data_id=%s, group=%s: %s", data_id, group, e)
 
     def register_service(self, service_name: str, ip: str, port: int, metadata: Optional[Dict] = None, retry: int = 0):
         """
@@ -71,20 +91,29 @@ class NacosClient:
                 result = self._client.add_naming_instance(service_name=service_name, ip=ip, port=port,
                                                           metadata=metadata)
                 if result:
-                    log.info(f"成功注册服务到 Nacos：{service_name} ({ip}:{port})")
+                    log.info("成功注册服务到 Nacos：%s (%s:%s)", service_name, ip, port)
                     return True
                 else:
-                    log.warning(f"注册服务失败 {service_name} ({ip}:{port}), 第 {attempt + 1} 次尝试")
+                    log.warning("注册服务失败 %s (%s:%s), 第 %d 次尝试", service_name, ip, port, attempt + 1)
             except Exception as e:
-                log.error(f"Nacos注册服务异常: {e}, 第 {attempt + 1} 次尝试")
+                log.error("Nacos注册服务异常: %s, 第 %d 次尝试", e, attempt + 1)
         return False
 
 
 # -----------------------------
 # Nacos 配置源（支持热更新）
 # -----------------------------
-import yaml
-import json
+def _load_json(raw: str):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _load_yaml(raw: str):
+    return yaml.load(raw, Loader=_YamlLoader)
+
+
+def _looks_like_json(raw: str) -> bool:
+    """第一个非空白字符为 { 或 [ 时按 JSON 处理"""
+    return raw.lstrip()[:1] in ("{", "[")
 
 
 class NacosResource(ConfigDataResource):
@@ -92,27 +121,49 @@ class NacosResource(ConfigDataResource):
         self.client = client
         self.data_id = data_id
         self.latest_data = {}
+        # (原始配置内容, 解析结果)
+        self._raw_cache = None
 
     def load(self) -> dict:
+        return self._parse(self.client.get_config(self.data_id))
+
+    def load_as(self, cls: Type[T]) -> T:
+        """
+        加载配置并转换为 cls 类型
+        - 安装了 msgspec 且配置为 JSON 对象时，由 msgspec 一次完成解析和类型转换（不更新 latest_data）
+        - 否则（或 msgspec 校验失败时）解析为字典后使用 as_dataclass 转换
+        """
         raw = self.client.get_config(self.data_id)
-        if not raw:
+        if msgspec is not None and raw and raw.lstrip("\ufeff \t\r\n")[:1] == "{":
+            try:
+                return msgspec.json.decode(raw.lstrip("\ufeff"), type=cls)
+            except msgspec.DecodeError:
+                # 字段大小写、类型与目标不完全一致时交给 as_dataclass 处理
+                pass
+        return as_dataclass(cls, self._parse(raw))
+
+    def _parse(self, raw: Optional[str]) -> dict:
+        if not raw or raw.isspace():
             return {}
+        if self._raw_cache is not None and self._raw_cache[0] == raw:
+            # 配置内容未变化（长轮询通知中很常见），直接复用上次的解析结果
+            return copy.deepcopy(self._raw_cache[1])
 
+        # 去掉 UTF-8 BOM，否则 JSON 解析器会直接报错
+        content = raw[1:] if raw[0] == "\ufeff" else raw
         data = {}
-        # 尝试解析为 YAML
-        try:
-            data = yaml.safe_load(raw)
-        except Exception:
-            # 如果 YAML 解析失败，尝试 JSON
+        # 根据第一个非空白字符判断格式，只调用对应的解析器；该解析器失败时才尝试另一种
+        for parser in (_load_json, _load_yaml) if _looks_like_json(content) else (_load_yaml, _load_json):
             try:
-                data = json.loads(raw)
-            except Exception:
-                # 最终失败，返回空字典
-                data = {}
+                data = parser(content)
+                break
+            except (ValueError, yaml.YAMLError):
+                continue
 
         if not isinstance(data, dict):
             data = {}
 
+        self._raw_cache = (raw, copy.deepcopy(data))
         self.latest_data = data
         return data
 
@@ -130,8 +181,9 @@ def init_nacos_onstartup(event: ApplicationStartupEvent):
     """加载并初始化配置"""
     from app.handler import NacosClient, NacosResolver
     from app.core import ImportResolver, CTX
-    nacos_clent = NacosClient(server_addresses=CTX.ENV.getprop("nacos.server.server_addresses", raise_error=True),
-                              namespace=CTX.ENV.getprop("nacos.server.namespace"),
-                              username=CTX.ENV.getprop("nacos.server.username", raise_error=True),
-                              password=CTX.ENV.getprop("nacos.server.password", raise_error=True))
+    server_config = CTX.ENV.getmany("nacos.server")
+    nacos_clent = NacosClient(server_addresses=server_config["server_addresses"],
+                              namespace=server_config.get("namespace"),
+                              username=server_config["username"],
+                              password=server_config["password"])
     ImportResolver.register("nacos", NacosResolver(nacos_clent))
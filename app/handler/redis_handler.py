@@ -15,24 +15,54 @@ class RedisClient:
     Redis 单例客户端封装 + 常用方法
 
     特性：
-    - 线程安全单例
+    - 线程安全单例，连接数有上限的连接池（默认阻塞等待空闲连接）
     - 支持 String, Hash, List, Set 基本操作
     - 支持 Key 操作（过期时间、TTL）
     - 支持获取分布式锁（Lock 对象）
+    - 支持 pipeline 批量操作，多条命令一次网络往返
     """
 
+    __slots__ = ("_client",)
+
     _instance_lock = threading.Lock()
     _instance: "RedisClient" = None
 
-    def __new__(cls, *args, **kwargs):
+    def __new__(cls, connection_class=redis.Connection, max_connections: int = 32, cache_factory=None, *,
+                blocking: bool = True, pool_timeout: float = 20, **kwargs):
+        """
+        位置参数与 redis.ConnectionPool 一致：(connection_class, max_connections, cache_factory)
+        :param connection_class: 连接类型
+        :param max_connections: 连接池最大连接数
+        :param cache_factory: 客户端缓存工厂，透传给连接池
+        :param blocking: True 使用 BlockingConnectionPool，连接用尽时排队等待而不是抛出异常
+        :param pool_timeout: 阻塞模式下等待空闲连接的最长时间（秒）
+        :param kwargs: 其余参数透传给连接池（host、port、db、password 等）
+        """
         if not cls._instance:
             with cls._instance_lock:
                 if not cls._instance:
-                    cls._instance = super().__new__(cls)
-                    # 使用连接池创建 redis.Redis 实例，提高性能
-                    cls._instance._client = redis.Redis(connection_pool=redis.ConnectionPool(*args, **kwargs))
+                    instance = super().__new__(cls)
+                    kwargs.setdefault("socket_keepalive", True)
+                    kwargs.setdefault("health_check_interval", 30)
+                    if cache_factory is not None:
+                        kwargs["cache_factory"] = cache_factory
+                    # BlockingConnectionPool 的位置参数顺序与 ConnectionPool 不同，统一按关键字传入
+                    if blocking:
+                        pool = redis.BlockingConnectionPool(connection_class=connection_class,
+                                                            max_connections=max_connections,
+                                                            timeout=pool_timeout, **kwargs)
+                    else:
+                        pool = redis.ConnectionPool(connection_class=connection_class,
+                                                    max_connections=max_connections, **kwargs)
+                    # 使用连接池创建 redis.Redis 实例，连接池本身线程安全，读取 _client 无需加锁
+                    instance._client = redis.Redis(connection_pool=pool)
+                    cls._instance = instance
         return cls._instance
 
+    def close(self):
+        """断开连接池中的所有连接，用于程序退出前清理"""
+        self._client.connection_pool.disconnect()
+
     @property
     def client(self) -> redis.Redis:
         """
@@ -89,6 +119,35 @@ class RedisClient:
         """
         return self._client.exists(key) > 0
 
+    # ------------------- 批量操作 -------------------
+    def pipeline(self, transaction: bool = False) -> redis.client.Pipeline:
+        """
+        创建 pipeline，命令先缓存在本地，execute() 时一次发送
+        :param transaction: True 表示使用 MULTI/EXEC 事务包裹
+        :return: redis.client.Pipeline 对象，可用作上下文管理器
+        """
+        return self._client.pipeline(transaction=transaction)
+
+    def mset_many(self, mapping: dict, ex: Optional[int] = None) -> list:
+        """
+        批量设置键值对，通过 pipeline 一次网络往返完成
+        :param mapping: 键值对
+        :param ex: 过期时间，单位秒（可选），对所有键生效
+        :return: 每个 SET 命令的结果
+        """
+        with self._client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+            return pipe.execute()
+
+    def mget(self, keys: List[str]) -> list:
+        """
+        批量获取键对应的值（MGET）
+        :param keys: 键名列表
+        :return: 值列表，顺序与 keys 一致，不存在的键为 None
+        """
+        return self._client.mget(keys)
+
     # ------------------- Hash 操作 -------------------
     def hset(self, name: str, key: str, value: Any) -> int:
         """
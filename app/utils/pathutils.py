@@ -5,10 +5,32 @@
 import logging
 import os
 import sys
+from functools import lru_cache
 from typing import Optional
 
 _log = logging.getLogger(__name__)
 
+# 是否为打包环境，导入时确定
+_FROZEN = bool(getattr(sys, "frozen", False))
+# 资源根目录，导入时确定
+if _FROZEN:
+    # PyInstaller/Nuitka/PyOxidizer 单文件模式
+    _BASE_PATH = getattr(sys, "_MEIPASS", None) or os.path.dirname(sys.executable)
+else:
+    # 开发环境：APP_PATH 或当前脚本目录
+    _BASE_PATH = os.getenv("APP_PATH", os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=256)
+def _resolve_path(path: str) -> str:
+    """
+    计算资源绝对路径（不检查存在性），结果按 path 缓存
+    """
+    # 绝对路径只做规范化；相对路径拼接后规范化一次
+    if os.path.isabs(path):
+        return os.path.normpath(path)
+    return os.path.normpath(os.path.join(_BASE_PATH, path))
+
 
 def getpath(path: str, raise_error=True) -> Optional[str]:
     """
@@ -23,27 +45,10 @@ def getpath(path: str, raise_error=True) -> Optional[str]:
             raise ValueError("path is empty")
         return None
 
-    path = os.path.normpath(path)
+    abs_path = _resolve_path(path)
 
-    # 绝对路径直接返回
-    if os.path.isabs(path):
-        abs_path = path
-    else:
-        # 判断打包环境
-        if getattr(sys, "frozen", False):
-            # PyInstaller/Nuitka/PyOxidizer 单文件模式
-            base_path = getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
-        else:
-            # 开发环境：APP_PATH 或当前脚本目录
-            base_path = os.getenv("APP_PATH", os.path.dirname(os.path.abspath(__file__)))
-        abs_path = os.path.join(base_path, path)
-
-    abs_path = os.path.normpath(abs_path)
-
-    # 检查路径存在性（读资源时启用）
-    if not os.path.exists(abs_path) and raise_error:
-        if raise_error:
-            raise FileNotFoundError(abs_path)
-        return None
+    # 检查路径存在性（读资源时启用），不需要时不做 stat
+    if raise_error and not os.path.exists(abs_path):
+        raise FileNotFoundError(abs_path)
 
     return abs_path
@@ -2,13 +2,491 @@
 # @author: licanglong
 # @date: 2025/6/9 11:39
 import json
+import math
+import sys
 from dataclasses import is_dataclass, fields, MISSING
 from datetime import datetime
 from decimal import Decimal
-from typing import Type, TypeVar, get_args, get_origin, Union, List, Tuple, Dict, Any, Set, Iterable, FrozenSet
+from enum import Enum
+from functools import singledispatch
+from typing import Type, TypeVar, get_args, get_origin, get_type_hints, Union, List, Tuple, Dict, Any, Set, Iterable, \
+    FrozenSet, Callable
+from uuid import UUID
+
+try:  # 可选依赖，安装后 asjson 使用 orjson 序列化
+    import orjson
+except ImportError:
+    orjson = None
 
 T = TypeVar('T')
 
+# 字段缺失标记，与 None 区分开
+_MISSING = object()
+
+# 类型标签：每个类型只解析一次 get_origin / get_args，转换时按标签分派
+_TAG_OTHER = 0
+_TAG_UNION = 1
+_TAG_DATACLASS = 2
+_TAG_LIST = 3
+_TAG_TUPLE = 4
+_TAG_SET = 5
+_TAG_FROZENSET = 6
+_TAG_DICT = 7
+_TAG_DATETIME = 8
+_TAG_DECIMAL = 9
+
+_ORIGIN_TAGS = {
+    list: _TAG_LIST, List: _TAG_LIST,
+    tuple: _TAG_TUPLE, Tuple: _TAG_TUPLE,
+    set: _TAG_SET, Set: _TAG_SET,
+    frozenset: _TAG_FROZENSET, FrozenSet: _TAG_FROZENSET,
+    dict: _TAG_DICT, Dict: _TAG_DICT,
+}
+# 可作为 as_dataclass 顶层类型的标签（容器及 Union）
+_ROOT_TAGS = frozenset((_TAG_UNION, _TAG_LIST, _TAG_TUPLE, _TAG_SET, _TAG_FROZENSET, _TAG_DICT))
+
+# _type_key(类型) -> (类型标签, 类型参数)；Union 的类型参数已去掉 NoneType
+_TYPE_INFO_CACHE: Dict[Any, Tuple[int, tuple]] = {}
+# (dataclass, ignore_case) -> 生成的构造函数 ctor(data, path)
+_CTOR_CACHE: Dict[Tuple[Any, bool], Callable[[dict, str], Any]] = {}
+# (_type_key(类型), ignore_case) -> 编译好的转换函数 convert(value, path)
+_CONVERTER_CACHE: Dict[Tuple[Any, bool], Callable[[Any, str], Any]] = {}
+# 容器分支要求的值类型，类型不符时转换必然抛出 TypeError
+_CONTAINER_ACCEPTS = {
+    _TAG_LIST: (list,),
+    _TAG_TUPLE: (list, tuple),
+    _TAG_DICT: (dict,),
+}
+# Set / FrozenSet 常见的输入类型，命中时无需经过 Iterable 的 ABC 检查
+_SET_SOURCES = frozenset((list, tuple, set, frozenset))
+# 自定义类型转换注册表 (目标类型, 源类型) -> 转换函数，导入时即包含默认的简单类型转换
+_TYPE_REGISTRY: Dict[Tuple[Any, Any], Any] = {
+    (int, str): int,
+    (str, int): str,
+    (int, float): round,
+}
+
+
+def register_type_converter(from_type, to_type, converter_func):
+    """注册自定义类型转换器：值的类型为 from_type、目标类型为 to_type 时调用 converter_func"""
+    _TYPE_REGISTRY[(to_type, from_type)] = converter_func
+    # 已编译的转换函数依据注册表做了预判，注册后需重新编译
+    _CONVERTER_CACHE.clear()
+    _CTOR_CACHE.clear()
+
+
+def _type_key(field_type):
+    """
+    类型缓存的 key。typing 认为仅分支顺序不同的 Union 相等（hash 也相同），而转换按声明顺序尝试分支，
+    因此连同递归展开的类型参数一起作为 key，使顺序不同的类型各自缓存。
+    """
+    args = get_args(field_type)
+    if not args:
+        return field_type
+    return field_type, tuple(_type_key(arg) for arg in args)
+
+
+def _resolve_type_info(field_type) -> Tuple[int, tuple]:
+    origin = get_origin(field_type) or getattr(field_type, "__origin__", None)
+    args = get_args(field_type)
+    if origin is Union:
+        return _TAG_UNION, tuple(arg for arg in args if arg is not type(None))
+    if is_dataclass(field_type):
+        return _TAG_DATACLASS, args
+    tag = _ORIGIN_TAGS.get(origin)
+    if tag is not None:
+        return tag, args
+    if field_type is datetime:
+        return _TAG_DATETIME, args
+    if field_type is Decimal:
+        return _TAG_DECIMAL, args
+    return _TAG_OTHER, args
+
+
+def _type_info(field_type) -> Tuple[int, tuple]:
+    """获取类型的 (标签, 参数)，结果按类型缓存"""
+    key = _type_key(field_type)
+    try:
+        info = _TYPE_INFO_CACHE.get(key)
+    except TypeError:  # 不可哈希的类型不缓存
+        return _resolve_type_info(field_type)
+    if info is None:
+        info = _TYPE_INFO_CACHE[key] = _resolve_type_info(field_type)
+    return info
+
+
+def _identity(value, path):
+    return value
+
+
+def _get_converter(field_type, ignore_case: bool = True) -> Callable[[Any, str], Any]:
+    """获取类型的转换函数，每个 (类型, ignore_case) 只编译一次"""
+    key = (_type_key(field_type), ignore_case)
+    try:
+        converter = _CONVERTER_CACHE.get(key)
+    except TypeError:  # 不可哈希的类型不缓存
+        return _compile_converter(field_type, ignore_case)
+    if converter is None:
+        converter = _CONVERTER_CACHE[key] = _compile_converter(field_type, ignore_case)
+    return converter
+
+
+def _registry_row(field_type) -> Dict[Any, Any]:
+    """取出注册表中目标类型为 field_type 的转换器：源类型 -> 转换函数；编译时取一次，注册新转换器后重新编译"""
+    return {from_type: fn for (to_type, from_type), fn in _TYPE_REGISTRY.items() if to_type == field_type}
+
+
+def _union_passes_through(value_type, args: tuple) -> bool:
+    """判断值类型为 value_type 时，Union 按声明顺序逐个尝试的结果是否必然是原样返回该值"""
+    try:
+        for arg in args:
+            if arg is Any or arg is value_type:
+                return True
+            tag = _type_info(arg)[0]
+            if tag == _TAG_DATACLASS:
+                if issubclass(value_type, dict):
+                    return False
+                continue
+            if (arg, value_type) in _TYPE_REGISTRY:
+                return False
+            accepts = _CONTAINER_ACCEPTS.get(tag)
+            if accepts is not None:
+                if issubclass(value_type, accepts):
+                    return False
+                continue
+            if tag == _TAG_OTHER:
+                return True
+            if tag == _TAG_DATETIME:
+                return not issubclass(value_type, str)
+            return False
+    except TypeError:
+        return False
+    return True
+
+
+def _compile_union(args: tuple, ignore_case: bool):
+    # 将 Union 的类型参数分为 dataclass 分支与其他分支，并记录容器分支可接受的值类型
+    dataclass_arms = []
+    other_arms = []
+    for arg in args:
+        tag = _type_info(arg)[0]
+        if tag == _TAG_DATACLASS:
+            dataclass_arms.append(_get_converter(arg, ignore_case))
+        else:
+            other_arms.append((_get_converter(arg, ignore_case), _CONTAINER_ACCEPTS.get(tag), _registry_row(arg)))
+    dataclass_arms = tuple(dataclass_arms)
+    other_arms = tuple(other_arms)
+    # 值的类型恰为某个简单分支类型、且排在前面的分支都不会处理它时，结果必然是原值，无需逐个尝试
+    passthrough = frozenset(
+        arg for arg in args if isinstance(arg, type) and _union_passes_through(arg, args)
+    )
+
+    if len(args) == 1:
+        # Optional[X]：只有一个分支时省去分支循环，转换失败同样原样返回
+        arm = _get_converter(args[0], ignore_case)
+        if arm is _identity:
+            return _identity
+
+        def convert(value, path):
+            if value is None or type(value) in passthrough:
+                return value
+            try:
+                return arm(value, path)
+            except Exception:
+                return value
+
+        return convert
+
+    def convert(value, path):
+        if value is None or type(value) in passthrough:
+            return value
+        # 字典优先尝试 dataclass；非字典不可能转换为 dataclass，直接跳过
+        if dataclass_arms and isinstance(value, dict):
+            for arm in dataclass_arms:
+                try:
+                    return arm(value, path)
+                except Exception:
+                    continue
+        # 按声明顺序尝试其他类型；值类型与容器分支不符且没有对应转换器时直接跳过，不再靠异常排除
+        value_type = type(value)
+        for arm, accepts, registered in other_arms:
+            if accepts is not None and not isinstance(value, accepts) and value_type not in registered:
+                continue
+            try:
+                return arm(value, path)
+            except Exception:
+                continue
+        return value
+
+    return convert
+
+
+def _compile_converter(field_type, ignore_case: bool) -> Callable[[Any, str], Any]:
+    """按类型标签生成转换函数，get_origin / get_args 及子类型的分派都在编译时完成"""
+    if field_type is Any:
+        return _identity
+
+    tag, args = _type_info(field_type)
+
+    # Union / Optional
+    if tag == _TAG_UNION:
+        return _compile_union(args, ignore_case)
+
+    # dataclass：字段计划在首次转换时才构建，自引用的 dataclass 不会在编译时无限递归
+    if tag == _TAG_DATACLASS:
+        def convert(value, path):
+            if value is None or type(value) is field_type:
+                return value
+            if not isinstance(value, dict):
+                raise TypeError(f"{path}: Expected dict for dataclass {field_type}, got {type(value)}")
+            nonlocal ctor
+            if ctor is None:
+                ctor = _get_ctor(field_type, ignore_case)
+            return ctor(value, path)
+
+        ctor = None
+        return convert
+
+    if tag == _TAG_LIST or tag == _TAG_TUPLE or tag == _TAG_SET or tag == _TAG_FROZENSET:
+        item_convert = _get_converter(args[0] if args else Any, ignore_case)
+        # 元素无需转换时直接调用容器构造函数，省去逐个元素的函数调用
+        copy_only = item_convert is _identity
+
+        if tag == _TAG_LIST and args and _type_info(args[0])[0] == _TAG_DATACLASS:
+            # List[dataclass]：普通 dict 行直接调用生成的构造函数，省去每行两层函数调用；其余情况走通用转换
+            item_type = args[0]
+
+            def build(value, path):
+                if not isinstance(value, list):
+                    raise TypeError(f"{path}: Expected list, got {type(value)}")
+                item_path = f"{path}[]"
+                ctor = _get_ctor(item_type, ignore_case)
+                return [ctor(v, item_path) if type(v) is dict else item_convert(v, item_path) for v in value]
+        elif tag == _TAG_LIST:
+            def build(value, path):
+                if not isinstance(value, list):
+                    raise TypeError(f"{path}: Expected list, got {type(value)}")
+                if copy_only:
+                    return list(value)
+                item_path = f"{path}[]"
+                return [item_convert(v, item_path) for v in value]
+        elif tag == _TAG_TUPLE:
+            def build(value, path):
+                if not isinstance(value, (list, tuple)):
+                    raise TypeError(f"{path}: Expected tuple/list, got {type(value)}")
+                if copy_only:
+                    return tuple(value)
+                item_path = f"{path}[]"
+                return tuple(item_convert(v, item_path) for v in value)
+        elif tag == _TAG_SET:
+            def build(value, path):
+                if type(value) not in _SET_SOURCES and (not isinstance(value, Iterable) or isinstance(value, str)):
+                    raise TypeError(f"{path}: Expected iterable for set, got {type(value)}")
+                if copy_only:
+                    return set(value)
+                item_path = f"{path}[]"
+                return {item_convert(v, item_path) for v in value}
+        else:
+            def build(value, path):
+                if type(value) not in _SET_SOURCES and (not isinstance(value, Iterable) or isinstance(value, str)):
+                    raise TypeError(f"{path}: Expected iterable for frozenset, got {type(value)}")
+                if copy_only:
+                    return frozenset(value)
+                item_path = f"{path}[]"
+                return frozenset(item_convert(v, item_path) for v in value)
+    elif tag == _TAG_DICT:
+        # 嵌套 Dict 时继续传递 ignore_case，保证内部 dataclass 解析依然大小写不敏感
+        val_convert = _get_converter(args[1] if args else Any, ignore_case)
+        copy_only = val_convert is _identity
+
+        def build(value, path):
+            if not isinstance(value, dict):
+                raise TypeError(f"{path}: Expected dict, got {type(value)}")
+            if copy_only:
+                return dict(value)
+            return {k: val_convert(v, f"{path}[{k}]") for k, v in value.items()}
+    elif tag == _TAG_DATETIME:
+        def build(value, path):
+            return datetime.fromisoformat(value) if isinstance(value, str) else value
+    elif tag == _TAG_DECIMAL:
+        def build(value, path):
+            # str / int 可直接构造且结果与先转字符串一致；float 等其他类型仍按字符串构造，避免二进制精度误差
+            value_type = type(value)
+            if value_type is str or value_type is int:
+                return Decimal(value)
+            return Decimal(str(value))
+    else:
+        build = _identity
+
+    # 自定义类型转换器按目标类型预先取出，没有对应转换器时不再查表
+    registered = _registry_row(field_type)
+    if not registered:
+        # 没有转换器的简单类型（如 float）必然原样返回，直接使用 _identity，容器据此走快速路径
+        if build is _identity:
+            return _identity
+
+        def convert(value, path):
+            if value is None or type(value) is field_type:
+                return value
+            return build(value, path)
+
+        return convert
+
+    def convert(value, path):
+        if value is None or type(value) is field_type:
+            return value
+        converter = registered.get(type(value))
+        if converter:
+            return converter(value)
+        return build(value, path)
+
+    return convert
+
+
+def _field_types(cls) -> Dict[str, Any]:
+    """将字符串形式的注解（如 from __future__ import annotations）解析为真实类型，每个类只解析一次"""
+    try:
+        return get_type_hints(cls)
+    except Exception:
+        pass
+    # 个别注解无法解析（如引用了函数内的局部类）时逐个字段解析，其余字段仍按真实类型转换，无法解析的沿用 field.type
+    module = sys.modules.get(cls.__module__)
+    globalns = getattr(module, "__dict__", {})
+    localns = dict(vars(cls))
+    hints = {}
+    for f in fields(cls):
+        if isinstance(f.type, str):
+            try:
+                hints[f.name] = eval(f.type, globalns, localns)
+            except Exception:
+                continue
+    return hints
+
+
+def _build_plan(cls, ignore_case: bool) -> tuple:
+    """
+    构建字段转换计划 ((字段名, 小写字段名, 字段转换函数, 默认值或 _MISSING, default_factory 或 None, 是否为 init 参数), ...)
+    init=False 的字段不从数据中取值，不编译转换函数
+    """
+    hints = _field_types(cls)
+    return tuple(
+        (
+            f.name,
+            f.name.lower(),
+            _get_converter(hints.get(f.name, f.type), ignore_case) if f.init else None,
+            f.default if f.default is not MISSING else _MISSING,
+            f.default_factory if f.default_factory is not MISSING else None,
+            f.init,
+        )
+        for f in fields(cls)
+    )
+
+
+def _can_assign_slots(cls) -> bool:
+    """
+    判断 __slots__ dataclass 能否跳过 __init__，以 object.__new__ 创建实例后直接给各字段赋值。
+
+    要求 __init__ 为 dataclass 生成、没有 __post_init__、非 frozen、没有 InitVar 字段，
+    且未自定义 __new__ / __setattr__，此时直接赋值（init=False 字段按 __init__ 的方式取默认值）与调用 __init__ 的结果一致。
+    """
+    if "__slots__" not in cls.__dict__ or hasattr(cls, "__post_init__"):
+        return False
+    params = cls.__dataclass_params__
+    if not params.init or params.frozen:
+        return False
+    if cls.__new__ is not object.__new__ or cls.__setattr__ is not object.__setattr__:
+        return False
+    code = getattr(cls.__init__, "__code__", None)
+    if code is None or not code.co_filename.startswith("<"):  # 类中自定义了 __init__
+        return False
+    return len(cls.__dataclass_fields__) == len(fields(cls))
+
+
+def _build_ctor(cls, ignore_case: bool) -> Callable[[dict, str], Any]:
+    """
+    按字段计划生成构造函数源码并 exec 编译，去掉逐字段的循环及 kwargs 字典。
+
+    生成的函数形如：
+        def ctor(data, path):
+            _v0 = data.get('name', _MISSING)
+            ...
+            return _cls(name=_v0, ...)
+    缺失字段、值为 None 的字段在生成时就确定取默认值、default_factory() 还是 None；
+    init=False 的字段不传给 __init__，由其自行取默认值。
+    满足条件的 __slots__ dataclass 改为 object.__new__ 后逐个赋值，省去 __init__ 的关键字参数调用。
+    """
+    namespace = {"_cls": cls, "_MISSING": _MISSING, "_new": object.__new__}
+    lines = ["def ctor(data, path):"]
+    if ignore_case:
+        lines.append("    lower_map = None")
+    call_args = []
+    # 直接赋值时 init=False 字段的默认值表达式，与 dataclass 生成的 __init__ 一致；无默认值的不赋值
+    non_init = []
+    for i, (name, lower_name, convert, default, default_factory, init) in enumerate(_build_plan(cls, ignore_case)):
+        var = f"_v{i}"
+        if not init:
+            if default_factory is not None:
+                namespace[f"_f{i}"] = default_factory
+                non_init.append((name, f"_f{i}()"))
+            elif default is not _MISSING:
+                namespace[f"_d{i}"] = default
+                non_init.append((name, f"_d{i}"))
+            continue
+        namespace[f"_c{i}"] = convert
+        if default_factory is not None:
+            namespace[f"_f{i}"] = default_factory
+            empty = f"_f{i}()"
+        else:
+            empty = "None"
+        if default is not _MISSING:
+            namespace[f"_d{i}"] = default
+            missing = f"_d{i}"
+        else:
+            missing = empty
+
+        lines.append(f"    {var} = data.get({name!r}, _MISSING)")
+        if ignore_case:
+            # 先按字段名精确匹配，未命中时才构建一次小写 key 映射
+            lines.append(f"    if {var} is _MISSING:")
+            lines.append("        if lower_map is None:")
+            # str.lower 对 ASCII key 走 C 快速路径，比 lru_cache 查表或 str.translate 更快
+            lines.append("            lower_map = {k.lower(): v for k, v in data.items()}")
+            lines.append(f"        {var} = lower_map.get({lower_name!r}, _MISSING)")
+        lines.append(f"    if {var} is _MISSING:")
+        lines.append(f"        {var} = {missing}")
+        lines.append(f"    elif {var} is None:")
+        lines.append(f"        {var} = {empty}")
+        lines.append("    else:")
+        lines.append(f"        {var} = _c{i}({var}, path + {'.' + name!r})")
+        call_args.append((name, var))
+    if _can_assign_slots(cls):
+        lines.append("    obj = _new(_cls)")
+        lines.extend(f"    obj.{name} = {var}" for name, var in call_args + non_init)
+        lines.append("    return obj")
+    else:
+        lines.append(f"    return _cls({', '.join(f'{name}={var}' for name, var in call_args)})")
+
+    exec(compile("\n".join(lines), f"<as_dataclass {cls.__qualname__}>", "exec"), namespace)
+    return namespace["ctor"]
+
+
+def _get_ctor(cls, ignore_case: bool = True) -> Callable[[dict, str], Any]:
+    """获取 dataclass 的构造函数，每个类只遍历一次 fields、解析一次注解并生成一次代码"""
+    key = (cls, ignore_case)
+    ctor = _CTOR_CACHE.get(key)
+    if ctor is None:
+        if not is_dataclass(cls):
+            raise TypeError(f"{cls} must be a dataclass")
+        ctor = _CTOR_CACHE[key] = _build_ctor(cls, ignore_case)
+    return ctor
+
+
+def _as_dataclass(cls, data, path="root", ignore_case: bool = True):
+    ctor = _get_ctor(cls, ignore_case)
+    if not isinstance(data, dict):
+        raise TypeError(f"{path}: Expected dict, got {type(data)}")
+    return ctor(data, path)
+
 
 def as_dataclass(cls: Type[T], data, ignore_case: bool = True) -> T:
     """
@@ -19,6 +497,7 @@ def as_dataclass(cls: Type[T], data, ignore_case: bool = True) -> T:
     - 支持嵌套 dataclass、datetime、Decimal 转换。
     - 支持通过 `as_dataclass.register_type_converter` 注册自定义类型转换器。
     - ignore_case=True 时，支持字典 key 不区分大小写。
+    - 每个类型只编译一次转换函数，每个 dataclass 只生成一次构造函数并缓存。
 
     参数：
         cls: 目标 dataclass 类型
@@ -28,181 +507,100 @@ def as_dataclass(cls: Type[T], data, ignore_case: bool = True) -> T:
     返回：
         cls 类型实例
     """
+    # 已是目标类型的实例时直接返回，重复转换是幂等的
+    if isinstance(cls, type) and isinstance(data, cls):
+        return data
 
-    # dataclass 字段缓存，提高性能
-    _FIELD_CACHE = {}
-    # 自定义类型转换注册表
-    type_registry = {}
-
-    def register_type_converter(from_type, to_type, converter_func):
-        type_registry[(to_type, from_type)] = converter_func
-
-    as_dataclass.register_type_converter = register_type_converter
-
-    def _get_fields(c):
-        if c not in _FIELD_CACHE:
-            _FIELD_CACHE[c] = fields(c)
-        return _FIELD_CACHE[c]
-
-    def _convert_value(field_type, value, path="root", ignore_case_local: bool = True):
-        if value is None:
-            return None
-
-        origin = get_origin(field_type) or getattr(field_type, "__origin__", None)
-        args = get_args(field_type)
-
-        # Union / Optional
-        if origin is Union:
-            non_none_args = [arg for arg in args if arg is not type(None)]
-            # 优先尝试 dataclass
-            for typ in non_none_args:
-                if is_dataclass(typ):
-                    try:
-                        return _as_dataclass(typ, value, path, ignore_case_local)
-                    except Exception:
-                        continue
-            # 尝试其他类型
-            for typ in non_none_args:
-                try:
-                    return _convert_value(typ, value, path, ignore_case_local)
-                except Exception:
-                    continue
-            return value
+    # 支持 List / Dict / Set 等容器类型及 Union 作为顶层类型
+    if _type_info(cls)[0] in _ROOT_TAGS:
+        return _get_converter(cls, ignore_case)(data, "root")
 
-        # dataclass
-        if is_dataclass(field_type):
-            if not isinstance(value, dict):
-                raise TypeError(f"{path}: Expected dict for dataclass {field_type}, got {type(value)}")
-            return _as_dataclass(field_type, value, path, ignore_case_local)
+    return _as_dataclass(cls, data, "root", ignore_case)
 
-        # 自定义类型转换器
-        converter = type_registry.get((field_type, type(value)))
-        if converter:
-            return converter(value)
 
-        # List
-        if origin in (list, List):
-            item_type = args[0] if args else Any
-            if not isinstance(value, list):
-                raise TypeError(f"{path}: Expected list, got {type(value)}")
-            return [_convert_value(item_type, v, f"{path}[]", ignore_case_local) for v in value]
-
-        # Tuple
-        if origin in (tuple, Tuple):
-            item_type = args[0] if args else Any
-            if not isinstance(value, (list, tuple)):
-                raise TypeError(f"{path}: Expected tuple/list, got {type(value)}")
-            return tuple(_convert_value(item_type, v, f"{path}[]", ignore_case_local) for v in value)
-
-        # Set / FrozenSet
-        if origin in (set, Set):
-            item_type = args[0] if args else Any
-            if not isinstance(value, Iterable) or isinstance(value, str):
-                raise TypeError(f"{path}: Expected iterable for set, got {type(value)}")
-            return {_convert_value(item_type, v, f"{path}[]", ignore_case_local) for v in value}
-
-        if origin in (frozenset, FrozenSet):
-            item_type = args[0] if args else Any
-            if not isinstance(value, Iterable) or isinstance(value, str):
-                raise TypeError(f"{path}: Expected iterable for frozenset, got {type(value)}")
-            return frozenset(_convert_value(item_type, v, f"{path}[]", ignore_case_local) for v in value)
-
-        # Dict
-        if origin in (dict, Dict):
-            key_type, val_type = args if args else (Any, Any)
-            if not isinstance(value, dict):
-                raise TypeError(f"{path}: Expected dict, got {type(value)}")
-            #  修复：在嵌套 Dict 时继续传递 ignore_case_local，保证内部 dataclass 解析依然大小写不敏感
-            return {k: _convert_value(val_type, v, f"{path}[{k}]", ignore_case_local) for k, v in value.items()}
+as_dataclass.register_type_converter = register_type_converter
 
-        # datetime
-        if field_type is datetime and isinstance(value, str):
-            return datetime.fromisoformat(value)
 
-        # Decimal
-        if field_type is Decimal:
-            return Decimal(str(value))
+@singledispatch
+def _json_default(obj):
+    """asjson 的自定义序列化规则，按对象类型分派；未注册的类型输出 null"""
+    return None
 
-        return value
 
-    def _as_dataclass(cls_inner, data_inner, path="root", ignore_case_local: bool = True):
-        if not is_dataclass(cls_inner):
-            raise TypeError(f"{cls_inner} must be a dataclass")
-        if not isinstance(data_inner, dict):
-            raise TypeError(f"{path}: Expected dict, got {type(data_inner)}")
-
-        data_map = {k.lower(): v for k, v in data_inner.items()} if ignore_case_local else data_inner
-        kwargs = {}
-        for field in _get_fields(cls_inner):
-            name = field.name
-            field_type = field.type
-            key = name.lower() if ignore_case_local else name
-            value = data_map.get(key, MISSING)
-
-            if value is MISSING:
-                if field.default is not MISSING:
-                    continue
-                elif field.default_factory is not MISSING:
-                    kwargs[name] = field.default_factory()
-                    continue
-                else:
-                    kwargs[name] = None
-                    continue
+@_json_default.register
+def _(obj: datetime):
+    return obj.strftime("%Y-%m-%d %H:%M:%S")
 
-            if value is None:
-                if field.default_factory is not MISSING:
-                    kwargs[name] = field.default_factory()
-                else:
-                    kwargs[name] = None
-                continue
 
-            kwargs[name] = _convert_value(field_type, value, f"{path}.{name}", ignore_case_local)
+@_json_default.register(set)
+@_json_default.register(frozenset)
+def _(obj):
+    return list(obj)
 
-        return cls_inner(**kwargs)
 
-    # 默认简单类型转换
-    register_type_converter(str, int, lambda v: int(v))
-    register_type_converter(int, str, lambda v: str(v))
-    register_type_converter(float, int, lambda v: round(v))
+# orjson 原生按值序列化 Enum、按字符串序列化 UUID，json 模块路径在此对齐
+@_json_default.register
+def _(obj: Enum):
+    return obj.value
 
-    #  新增：支持 List / Dict / Set 等容器类型作为顶层类型
-    root_origin = get_origin(cls)
-    if root_origin in (list, List, tuple, Tuple, set, Set, frozenset, FrozenSet, dict, Dict, Union):
-        #  传递 ignore_case 参数，确保顶层容器内 dataclass 也能无视 key 大小写
-        return _convert_value(cls, data, "root", ignore_case)
 
-    return _as_dataclass(cls, data, "root", ignore_case)
+@_json_default.register
+def _(obj: UUID):
+    return str(obj)
+
+
+def _has_non_finite(obj) -> bool:
+    """递归检查是否包含 NaN / Infinity"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _replace_non_finite(obj):
+    """将 NaN / Infinity 替换为 None，与 orjson 的输出保持一致"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _replace_non_finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(v) for v in obj]
+    return obj
+
+
+def _json_default_finite(obj):
+    return _replace_non_finite(_json_default(obj))
+
+
+# datetime / date / time 及 dataclass 交给 _json_default 处理，与 json 模块的输出保持一致
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+
+
+def _json_dumps(data) -> str:
+    """json 模块路径：紧凑分隔符，NaN / Infinity 输出 null，与 orjson 路径一致"""
+    # 只在确实含有 NaN / Infinity 时才复制替换；default 返回的值同样经过替换
+    if _has_non_finite(data):
+        data = _replace_non_finite(data)
+    return json.dumps(data, ensure_ascii=False, default=_json_default_finite, separators=(",", ":"), allow_nan=False)
 
 
 def asjson(data: dict):
-    """转为 JSON 字符串（QML 最安全）"""
-
-    def datetime_serializable(obj):
-        if isinstance(obj, datetime):
-            return obj.strftime("%Y-%m-%d %H:%M:%S")
-        return None  # 继续下一个规则
-
-    def set_serializable(obj):
-        if isinstance(obj, set):
-            return list(obj)  # 将 set 转换为 list
-        return None
-
-    def default_serializable(obj):
-        # 默认的序列化方式，返回 None 让 json 处理其他类型
-        return None
-
-    # 注册所有序列化规则
-    serializers = {
-        datetime: datetime_serializable,
-        set: set_serializable,
-    }
-
-    # 处理自定义序列化的函数
-    def custom_serializer(obj):
-        # 查找适用的自定义序列化规则
-        for typ, serializer in serializers.items():
-            if isinstance(obj, typ):
-                return serializer(obj)  # 使用对应类型的序列化方法
-        return default_serializable(obj)  # 如果没有找到，则使用默认序列化
-
-    return json.dumps(data, ensure_ascii=False, default=custom_serializer)
+    """
+    转为紧凑的 JSON 字符串（QML 最安全），安装了 orjson 时使用其 C 实现序列化。
+
+    两条路径输出一致：datetime 格式化为 "%Y-%m-%d %H:%M:%S"，set / frozenset 转为 list，Enum 取值，
+    UUID 转为字符串，NaN / Infinity 输出 null，其余无法序列化的类型输出 null。
+    唯一差别是极大/极小浮点数的指数写法（orjson 为 1e16，json 模块为 1e+16），数值相同。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS).decode()
+        except orjson.JSONEncodeError:  # 超出 64 位的整数等 orjson 不支持的数据交给 json 模块处理
+            pass
+    return _json_dumps(data)
@@ -2,7 +2,21 @@
 # @author: licanglong
 # @date: 2025/6/25 9:04
 # hook-task_executor.task.py
-from PyInstaller.utils.hooks import collect_submodules
+import os
+
+from PyInstaller.utils.hooks import collect_submodules, get_module_file_attribute
 
 # 把 handlers 及其所有子包全部打进 hiddenimports
 hiddenimports = collect_submodules('app.handler')
+
+# 生成 handler 清单，打包后的程序启动时按清单导入，无需扫描目录
+_MANIFEST = 'app.handler._manifest'
+_modules = sorted(m for m in hiddenimports if m.count('.') == 2 and m != _MANIFEST)
+_manifest_path = os.path.join(os.path.dirname(get_module_file_attribute('app.handler')), '_manifest.py')
+with open(_manifest_path, 'w', encoding='utf-8') as f:
+    f.write('# 由 hooks/hook-app.handler.py 在打包时生成，请勿手动修改\n')
+    f.write('MODULES = (\n')
+    for _name in _modules:
+        f.write(f'    {_name!r},\n')
+    f.write(')\n')
+hiddenimports.append(_MANIFEST)
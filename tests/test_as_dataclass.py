@@ -8,6 +8,7 @@ from typing import List, Dict, Optional, Union, Set, FrozenSet, Tuple, Generic,
 
 import pytest
 
+from app.utils import typeutils
 from app.utils.typeutils import as_dataclass
 
 T = TypeVar('T')
@@ -16,15 +17,16 @@ T = TypeVar('T')
 # =====================
 #   定义复杂结构
 # =====================
+# 批量转换的 dataclass 建议使用 slots=True：实例不再分配 __dict__，as_dataclass 也可跳过 __init__ 直接赋值
 
-@dataclass
+@dataclass(slots=True)
 class Address:
     city: str
     zipcode: int
     location: Optional[Dict[str, float]] = None  # dict 嵌套基本类型
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     name: str
     founded: datetime
@@ -33,7 +35,7 @@ class Company:
     branch_addresses: Dict[str, Address] = field(default_factory=dict)  # dict 嵌套 dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     id: int
     name: str
@@ -185,3 +187,225 @@ def test_as_dataclass_top_level_list():
     result = as_dataclass(List[Address], data)
     assert all(is_dataclass(x) for x in result)
     assert result[1].zipcode == 222
+
+
+def test_as_dataclass_repeated():
+    """测试重复转换同一 dataclass 时复用缓存的字段计划，结果一致"""
+    data = {
+        "requestId": "r-1",
+        "data": {"code": "0", "data": {"id": "7", "name": "Bob"}, "message": None},
+        "error": {"message": "ok"},
+    }
+    first = as_dataclass(DpptResponseResult, data)
+    second = as_dataclass(DpptResponseResult, data)
+    assert first == second
+    assert first.RequestId == "r-1"
+    assert first.Error.Message == "ok"
+
+
+@dataclass
+class UnionHolder:
+    number: Union[List[int], int, str]
+    amount: Union[Decimal, int]
+    target: Union[Address, str, None] = None
+
+
+def test_as_dataclass_union_dispatch():
+    """测试 Union：按声明顺序转换，跳过值类型不符的容器分支，字典优先转换为 dataclass"""
+    result = as_dataclass(UnionHolder, {"number": [1, "2"], "amount": 3, "target": "x"})
+    assert result.number == [1, 2] and result.amount == Decimal(3) and result.target == "x"
+
+    result = as_dataclass(UnionHolder, {"number": "7", "amount": "2.5", "target": {"city": "A", "zipcode": "1"}})
+    assert result.number == 7
+    assert result.amount == Decimal("2.5")
+    assert result.target == Address(city="A", zipcode=1)
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    """在注册表副本及空的编译缓存上运行，测试结束后恢复，注册的转换器不影响其他测试"""
+    monkeypatch.setattr(typeutils, "_TYPE_REGISTRY", dict(typeutils._TYPE_REGISTRY))
+    monkeypatch.setattr(typeutils, "_CONVERTER_CACHE", {})
+    monkeypatch.setattr(typeutils, "_CTOR_CACHE", {})
+
+
+def test_register_type_converter_persists(isolated_registry):
+    """测试自定义转换器在导入后即可注册，且不会被后续调用覆盖"""
+    @dataclass
+    class Flag:
+        enabled: bool
+
+    as_dataclass.register_type_converter(str, bool, lambda v: v.lower() in ("1", "true", "yes"))
+    assert as_dataclass(Flag, {"enabled": "Yes"}).enabled is True
+    assert as_dataclass(Flag, {"enabled": "no"}).enabled is False
+
+
+@dataclass
+class StringAnnotated:
+    count: "int"
+    items: "List[Address]" = field(default_factory=list)
+
+
+def test_as_dataclass_string_annotations():
+    """测试字符串形式的字段注解按真实类型转换"""
+    result = as_dataclass(StringAnnotated, {"count": "3", "items": [{"city": "A", "zipcode": "1"}]})
+    assert result.count == 3
+    assert result.items == [Address(city="A", zipcode=1)]
+
+
+@dataclass
+class TreeNode:
+    name: str
+    children: List["TreeNode"] = field(default_factory=list)
+
+
+def test_as_dataclass_self_reference():
+    """测试自引用 dataclass 编译转换函数时不会无限递归"""
+    result = as_dataclass(TreeNode, {"name": "a", "Children": [{"NAME": "b", "children": [{"name": "c"}]}]})
+    assert result.children[0].children[0] == TreeNode(name="c")
+
+
+def test_union_passthrough_respects_registry(isolated_registry):
+    """测试 Union 原样返回的快速路径在注册新转换器后重新判断"""
+    class Marker(str):
+        pass
+
+    @dataclass
+    class Holder:
+        value: Union[Marker, int, str]
+
+    assert as_dataclass(UnionHolder, {"number": 5, "amount": Decimal("1")}).number == 5
+    assert type(as_dataclass(Holder, {"value": "x"}).value) is str
+    as_dataclass.register_type_converter(str, Marker, Marker)
+    assert type(as_dataclass(Holder, {"value": "x"}).value) is Marker
+
+
+def test_as_dataclass_list_of_dataclass_rows():
+    """测试 List[dataclass] 中混合 dict、已转换实例、None 及非法行的处理"""
+    existing = Address(city="C", zipcode=3)
+    result = as_dataclass(List[Address], [{"City": "A", "zipcode": "1"}, existing, None])
+    assert result == [Address(city="A", zipcode=1), existing, None]
+    with pytest.raises(TypeError):
+        as_dataclass(List[Address], [{"city": "A", "zipcode": 1}, "bad"])
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """分别在 orjson 及 json 模块两条路径上运行 asjson 测试"""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(typeutils, "orjson", None)
+    return request.param
+
+
+def test_asjson(json_backend):
+    """测试 asjson 在 orjson 与 json 模块两条路径上输出完全一致"""
+    import json
+    from enum import Enum
+    from uuid import UUID
+
+    from app.utils.typeutils import asjson
+
+    class Color(Enum):
+        RED = "red"
+
+    uid = UUID(int=1)
+    data = {"t": datetime(2021, 4, 1, 9, 0), "s": {1}, "f": frozenset([2]), 2: "中文", "d": Decimal("1"),
+            "e": Color.RED, "u": uid, "n": [float("nan"), float("inf"), 1.5]}
+    assert asjson(data) == (
+        '{"t":"2021-04-01 09:00:00","s":[1],"f":[2],"2":"中文","d":null,'
+        f'"e":"red","u":"{uid}","n":[null,null,1.5]}}'
+    )
+    assert json.loads(asjson({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_as_dataclass_slots_direct_assign():
+    """测试 __slots__ dataclass 直接赋值与走 __init__ 的结果一致，带 __post_init__ 的类仍调用 __init__"""
+    from app.utils.typeutils import _can_assign_slots
+
+    @dataclass(slots=True)
+    class Checked:
+        value: int
+        doubled: int = 0
+
+        def __post_init__(self):
+            self.doubled = self.value * 2
+
+    assert _can_assign_slots(Address)
+    assert not _can_assign_slots(Checked)
+    assert as_dataclass(Address, {"city": "A", "zipcode": "1"}) == Address(city="A", zipcode=1, location=None)
+    assert as_dataclass(Checked, {"value": "2"}).doubled == 4
+
+
+def test_as_dataclass_idempotent(complex_data):
+    """测试对已转换的实例再次调用 as_dataclass 时原样返回"""
+    emp = as_dataclass(Employee, complex_data)
+    assert as_dataclass(Employee, emp) is emp
+
+
+def test_as_dataclass_partial_string_annotations():
+    """测试部分字符串注解无法解析时，其余字段仍按真实类型转换"""
+    class Local:
+        pass
+
+    @dataclass
+    class Partial:
+        count: "int"
+        items: "List[int]"
+        other: "Local" = None
+
+    result = as_dataclass(Partial, {"count": "3", "items": ["1", 2], "other": "x"})
+    assert result.count == 3 and result.items == [1, 2] and result.other == "x"
+
+
+def test_as_dataclass_optional_single_arm():
+    """测试 Optional[X] 单分支：正常转换，转换失败时与多分支 Union 一样原样返回"""
+    @dataclass
+    class Opt:
+        count: Optional[int] = None
+        ratio: Optional[float] = None
+        address: Optional[Address] = None
+
+    result = as_dataclass(Opt, {"count": "3", "ratio": 0.5, "address": {"city": "A", "zipcode": "1"}})
+    assert result == Opt(count=3, ratio=0.5, address=Address(city="A", zipcode=1))
+    result = as_dataclass(Opt, {"count": "abc", "address": "x"})
+    assert result.count == "abc" and result.address == "x"
+
+
+def test_union_arm_order_not_shared():
+    """测试仅分支顺序不同的 Union 各自按声明顺序转换，结果不受先编译的类型影响"""
+    @dataclass
+    class FloatFirst:
+        v: Union[float, int]
+
+    @dataclass
+    class IntFirst:
+        v: Union[int, float]
+
+    assert as_dataclass(FloatFirst, {"v": "5"}).v == "5"
+    assert as_dataclass(IntFirst, {"v": "5"}).v == 5
+    assert as_dataclass(IntFirst, {"v": 2.5}).v == 2
+    assert as_dataclass(FloatFirst, {"v": 2.5}).v == 2.5
+
+
+def test_as_dataclass_init_false_field():
+    """测试 init=False 字段不传给 __init__，普通类与 __slots__ 类均取其默认值"""
+    @dataclass
+    class Plain:
+        x: int
+        y: int = field(init=False, default=5)
+        z: List[int] = field(init=False, default_factory=list)
+
+    @dataclass(slots=True)
+    class Slotted:
+        x: int
+        y: int = field(init=False, default=5)
+        z: List[int] = field(init=False, default_factory=list)
+
+    from app.utils.typeutils import _can_assign_slots
+    assert _can_assign_slots(Slotted)
+    for cls in (Plain, Slotted):
+        result = as_dataclass(cls, {"x": "1", "y": "9"})
+        assert (result.x, result.y, result.z) == (1, 5, [])
+        assert result == cls(x=1)
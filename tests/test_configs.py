@@ -0,0 +1,196 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 10:20
+import copy
+import os
+
+import pytest
+
+from app.core.configs import FileResource, CONFIG_NOCACHE_ENV
+
+
+@pytest.fixture
+def isolated_config():
+    """快照 CTX.ENV、ImportResolver 的缓存条目及解析器，测试结束后恢复，避免测试间相互影响"""
+    from app.core import CTX, ImportResolver
+    import app.handler.configs_handler  # noqa: F401 注册解析器及事件订阅，需在快照前完成
+
+    env = copy.deepcopy(dict(CTX.ENV))
+    with ImportResolver.lock:
+        cached_imports = list(ImportResolver.cached_imports)
+    resolvers = dict(ImportResolver.resolvers)
+    yield
+    CTX.ENV.clear()
+    CTX.ENV.update(env)
+    with ImportResolver.lock:
+        ImportResolver.cached_imports.clear()
+        ImportResolver.cached_imports.extend(cached_imports)
+    ImportResolver.resolvers.clear()
+    ImportResolver.resolvers.update(resolvers)
+
+
+def test_file_resource_json_cache(tmp_path, monkeypatch):
+    """测试 FileResource 解析结果写入 JSON 缓存，并在源文件更新后失效"""
+    monkeypatch.delenv(CONFIG_NOCACHE_ENV, raising=False)
+    config = tmp_path / "env.yml"
+    config.write_text("log:\n  level: INFO\n", encoding="utf-8")
+    cache = tmp_path / "env.yml.cache.json"
+
+    assert FileResource(str(config)).load() == {"log": {"level": "INFO"}}
+    assert cache.exists()
+    # 命中缓存
+    assert FileResource(str(config)).load() == {"log": {"level": "INFO"}}
+
+    # 源文件更新后缓存失效
+    config.write_text("log:\n  level: DEBUG\n", encoding="utf-8")
+    st = cache.stat()
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert FileResource(str(config)).load() == {"log": {"level": "DEBUG"}}
+
+
+def test_file_resource_cache_restored_older_mtime(tmp_path, monkeypatch):
+    """测试源文件被还原为更早的修改时间时，JSON 缓存同样失效"""
+    monkeypatch.delenv(CONFIG_NOCACHE_ENV, raising=False)
+    config = tmp_path / "env.yml"
+    config.write_text("log:\n  level: INFO\n", encoding="utf-8")
+    st = config.stat()
+    assert FileResource(str(config)).load() == {"log": {"level": "INFO"}}
+
+    # 模拟 cp -p / git 回滚：内容改变，修改时间早于缓存文件
+    config.write_text("log:\n  level: WARN\n", encoding="utf-8")
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns - 10 ** 9))
+    assert FileResource(str(config)).load() == {"log": {"level": "WARN"}}
+
+
+def test_file_resource_nocache(tmp_path, monkeypatch):
+    """测试设置 APP_CONFIG_NOCACHE 后不写缓存"""
+    monkeypatch.setenv(CONFIG_NOCACHE_ENV, "1")
+    config = tmp_path / "env.yml"
+    config.write_text("a: 1\n", encoding="utf-8")
+    assert FileResource(str(config)).load() == {"a": 1}
+    assert not (tmp_path / "env.yml.cache.json").exists()
+
+
+def test_file_resource_missing(tmp_path):
+    """测试配置文件不存在时返回空字典"""
+    assert FileResource(str(tmp_path / "missing.yml")).load() == {}
+
+
+def test_import_resolution(tmp_path, isolated_config):
+    """测试 config.imports 中的 file: 条目被解析并合并到 CTX.ENV，嵌套 import 同样生效"""
+    from app.core import CTX
+    import app.handler.configs_handler  # noqa: F401 注册解析器及事件订阅
+
+    nested = tmp_path / "nested.yml"
+    nested.write_text("test_import:\n  nested: true\n", encoding="utf-8")
+    child = tmp_path / "child.yml"
+    child.write_text(f"test_import:\n  child: 1\nconfig:\n  imports:\n    - file:{nested}\n", encoding="utf-8")
+    root = tmp_path / "root.yml"
+    root.write_text(f"config:\n  imports:\n    - file:{child}\n    - unknown:abc\n", encoding="utf-8")
+
+    CTX.ENV.merge_source(FileResource(str(root)))
+    assert CTX.ENV.getprop("test_import.child") == 1
+    assert CTX.ENV.getprop("test_import.nested") is True
+    # 未注册协议的条目保留在缓存中，已解析的条目被移除
+    from app.core import ImportResolver
+    assert "unknown:abc" in ImportResolver.cached_imports
+    assert f"file:{child}" not in ImportResolver.cached_imports
+
+
+def test_file_resource_memory_cache(tmp_path, monkeypatch):
+    """测试文件未变化时复用进程内解析结果，且返回副本互不影响"""
+    monkeypatch.setenv(CONFIG_NOCACHE_ENV, "1")
+    config = tmp_path / "env.yml"
+    config.write_text("log:\n  level: INFO\n", encoding="utf-8")
+
+    first = FileResource(str(config)).load()
+    first["log"]["level"] = "changed"
+    assert FileResource(str(config)).load() == {"log": {"level": "INFO"}}
+
+
+def test_import_resolution_batched(tmp_path, isolated_config):
+    """测试每次 add_imports 只触发一次解析事件，嵌套 import 随所在文件各触发一次"""
+    from app.core import CTX, EM, ImportResolver, RegisterResolversEvent
+    import app.handler.configs_handler  # noqa: F401 注册解析器及事件订阅
+
+    events = []
+
+    def on_event(event):
+        events.append(event.protocols)
+
+    EM.subscribe(RegisterResolversEvent)(on_event)
+    try:
+        leaves = []
+        for i in range(3):
+            leaf = tmp_path / f"leaf{i}.yml"
+            leaf.write_text(f"test_coalesce:\n  leaf{i}: {i}\n", encoding="utf-8")
+            mid = tmp_path / f"mid{i}.yml"
+            mid.write_text(f"config:\n  imports:\n    - file:{leaf}\n", encoding="utf-8")
+            leaves.append(f"file:{mid}")
+        ImportResolver.add_imports(leaves)
+    finally:
+        EM.unsubscribe(RegisterResolversEvent, on_event)
+
+    assert events == [["file"]] * 4
+    assert CTX.ENV.getmany("test_coalesce") == {"leaf0": 0, "leaf1": 1, "leaf2": 2}
+
+
+def test_import_resolution_nested_order(tmp_path, isolated_config):
+    """测试任意层级都是导入方覆盖被导入的配置"""
+    from app.core import CTX, ImportResolver
+
+    leaf = tmp_path / "leaf.yml"
+    leaf.write_text("test_nested:\n  a: leaf\n  b: leaf\n  c: leaf\n", encoding="utf-8")
+    child = tmp_path / "child.yml"
+    child.write_text(f"config:\n  imports:\n    - file:{leaf}\ntest_nested:\n  b: child\n  c: child\n",
+                     encoding="utf-8")
+    root = tmp_path / "root.yml"
+    root.write_text(f"config:\n  imports:\n    - file:{child}\ntest_nested:\n  c: root\n", encoding="utf-8")
+    ImportResolver.add_imports([f"file:{root}"])
+
+    assert CTX.ENV.getmany("test_nested") == {"a": "leaf", "b": "child", "c": "root"}
+
+
+def test_import_resolution_ignores_non_str(tmp_path, isolated_config):
+    """测试非字符串的 import 条目被忽略，不影响其余条目的解析"""
+    from app.core import CTX, ImportResolver
+
+    leaf = tmp_path / "leaf.yml"
+    leaf.write_text("test_non_str:\n  k: v\n", encoding="utf-8")
+    root = tmp_path / "root.yml"
+    root.write_text(f"config:\n  imports:\n    - 123\n    - null\n    - file:{leaf}\n", encoding="utf-8")
+    ImportResolver.add_imports([f"file:{root}"])
+
+    assert CTX.ENV.getprop("test_non_str.k") == "v"
+    assert all(isinstance(imp, str) for imp in ImportResolver.cached_imports)
+
+
+def test_import_resolution_releases_lock(tmp_path, isolated_config):
+    """测试加载 import 的配置时不持有 ImportResolver.lock，其他线程可同时读写缓存"""
+    import threading
+
+    from app.core import ImportResolver, ConfigDataLocationResolver, ConfigDataResource
+    import app.handler.configs_handler  # noqa: F401 注册解析器及事件订阅
+
+    acquired = []
+
+    class ProbeResource(ConfigDataResource):
+        def load(self):
+            def probe():
+                ok = ImportResolver.lock.acquire(timeout=1)
+                acquired.append(ok)
+                if ok:
+                    ImportResolver.lock.release()
+
+            t = threading.Thread(target=probe)
+            t.start()
+            t.join()
+            return {}
+
+    class ProbeResolver(ConfigDataLocationResolver):
+        def resolve(self, location):
+            return ProbeResource()
+
+    ImportResolver.resolvers["probe"] = ProbeResolver()
+    ImportResolver.add_imports(["probe:x"])
+    assert acquired == [True]
@@ -0,0 +1,160 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 14:30
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from app.core.events import Event, EventBus
+
+
+class BaseEvent(Event):
+    pass
+
+
+class ChildEvent(BaseEvent):
+    pass
+
+
+def test_emit_priority_and_inheritance():
+    """测试按优先级执行订阅者，子类事件同时触发父类订阅"""
+    bus = EventBus()
+    calls = []
+
+    @bus.subscribe(BaseEvent, priority=1)
+    def on_base(event):
+        calls.append("base")
+
+    @bus.subscribe(ChildEvent, priority=5)
+    def on_child(event):
+        calls.append("child")
+
+    bus.emit(ChildEvent())
+    assert calls == ["child", "base"]
+
+    calls.clear()
+    bus.emit(BaseEvent())
+    assert calls == ["base"]
+
+
+def test_emit_after_subscription_change():
+    """测试订阅、注销后再次触发事件能得到最新的订阅者"""
+    bus = EventBus()
+    calls = []
+    bus.emit(BaseEvent())
+
+    @bus.subscribe(BaseEvent)
+    def first(event):
+        calls.append("first")
+
+    bus.emit(BaseEvent())
+    assert calls == ["first"]
+
+    bus.unsubscribe(BaseEvent, first)
+    bus.emit(BaseEvent())
+    assert calls == ["first"]
+
+
+def test_emit_once_and_condition():
+    """测试一次性订阅和条件订阅"""
+    bus = EventBus()
+    calls = []
+
+    @bus.subscribe(BaseEvent, once=True)
+    def once(event):
+        calls.append("once")
+
+    @bus.subscribe(BaseEvent, condition=lambda e: e.source == "ok")
+    def conditional(event):
+        calls.append("conditional")
+
+    bus.emit(BaseEvent(source="ok"))
+    bus.emit(BaseEvent(source="skip"))
+    assert calls == ["once", "conditional"]
+
+
+def test_async_subscriber():
+    """测试异步订阅者在线程池中执行"""
+    bus = EventBus()
+    done = threading.Event()
+    names = []
+
+    @bus.subscribe(BaseEvent, async_=True)
+    def on_async(event):
+        names.append(threading.current_thread().name)
+        done.set()
+
+    bus.emit(BaseEvent())
+    assert done.wait(2)
+    assert names[0].startswith("evt")
+    bus.close()
+
+
+def test_async_slow_subscriber_does_not_block():
+    """测试耗时的异步回调不阻塞后续异步分发，且工作线程为守护线程"""
+    bus = EventBus()
+    release = threading.Event()
+    done = threading.Event()
+    daemons = []
+
+    class SlowEvent(BaseEvent):
+        pass
+
+    @bus.subscribe(SlowEvent, async_=True)
+    def on_slow(event):
+        daemons.append(threading.current_thread().daemon)
+        release.wait(5)
+
+    @bus.subscribe(ChildEvent, async_=True)
+    def on_fast(event):
+        done.set()
+
+    try:
+        for _ in range(2 * (os.cpu_count() or 4)):
+            bus.emit(SlowEvent())
+        bus.emit(ChildEvent())
+        assert done.wait(2)
+    finally:
+        release.set()
+        bus.close()
+    assert daemons and all(daemons)
+
+
+def test_async_subscriber_does_not_block_exit():
+    """测试仍在执行的异步回调不阻止进程退出"""
+    code = (
+        "import time\n"
+        "from app.core.events import EM, Event\n"
+        "EM.subscribe(Event, async_=True)(lambda e: time.sleep(60))\n"
+        "EM.emit(Event())\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, timeout=20)
+    assert result.returncode == 0
+
+
+def test_event_timestamp():
+    """测试事件时间戳为单调时钟纳秒，wall_time 换算为系统时间"""
+    before = time.time()
+    event = BaseEvent()
+    assert isinstance(event.timestamp, int)
+    assert event.timestamp <= time.monotonic_ns()
+    assert before - 1 <= event.wall_time <= time.time() + 1
+
+
+def test_unsubscribe_drops_empty_type():
+    """测试注销最后一个订阅者或清理后，事件类型从订阅表中移除"""
+    bus = EventBus()
+
+    def on_base(event):
+        pass
+
+    bus.subscribe(BaseEvent)(on_base)
+    bus.subscribe(ChildEvent)(on_base)
+    bus.unsubscribe(BaseEvent, on_base)
+    assert BaseEvent not in bus._subscribers
+    bus.unsubscribe(BaseEvent, on_base)
+    bus.clear(ChildEvent)
+    assert bus._subscribers == {}
@@ -0,0 +1,68 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 16:10
+import logging
+import os
+import sys
+
+from app.core import ColorConsoleFormatter
+from app.handler.logs_handler import CachedRolloverHandler, BufferedConcurrentTimedRotatingFileHandler
+
+
+def test_should_rollover_without_stat(tmp_path, monkeypatch):
+    """测试未到切割时间时不访问文件系统，到达切割时间后返回 True"""
+    handler = CachedRolloverHandler(str(tmp_path / "app.log"), when="midnight", encoding="utf-8")
+    try:
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unexpected filesystem access")
+
+        monkeypatch.setattr(os.path, "exists", fail)
+        monkeypatch.setattr(os.path, "isfile", fail)
+        record.created = handler.rolloverAt - 1
+        assert handler.shouldRollover(record) is False
+        record.created = handler.rolloverAt
+        assert handler.shouldRollover(record) is True
+    finally:
+        monkeypatch.undo()
+        handler.close()
+
+
+def test_color_console_formatter():
+    """测试彩色控制台格式：按级别取模板，包含位置信息与异常堆栈"""
+    formatter = ColorConsoleFormatter()
+    record = logging.LogRecord("t", logging.WARNING, "/src/mod.py", 12, "hello %s", ("world",), None,
+                               func="run")
+    text = formatter.format(record)
+    assert ColorConsoleFormatter.YELLOW + "hello world" in text
+    assert "mod.py:run:12".ljust(40) + ":" in text
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("t", logging.ERROR, "/src/mod.py", 12, "failed", None, sys.exc_info())
+    text = formatter.format(record)
+    assert text.splitlines()[0].endswith(ColorConsoleFormatter.RESET)
+    assert "ValueError: boom" in text
+
+
+def test_buffered_handler_rollover_boundary(tmp_path):
+    """测试缓冲区中跨过切割时间的日志分别写入切割前后的文件"""
+    path = tmp_path / "app.log"
+    handler = BufferedConcurrentTimedRotatingFileHandler(str(path), when="midnight", encoding="utf-8",
+                                                          buffer_size=1024 * 1024, flush_interval=60)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    boundary = handler.rolloverAt
+    try:
+        for created, msg in ((boundary - 5, "before"), (boundary + 5, "after")):
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+            record.created = created
+            handler.emit(record)
+    finally:
+        handler.close()
+
+    rotated = [p for p in tmp_path.iterdir() if p.name.startswith("app.log.")]
+    assert len(rotated) == 1
+    assert rotated[0].read_text(encoding="utf-8") == "before\n"
+    assert path.read_text(encoding="utf-8") == "after\n"
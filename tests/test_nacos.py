@@ -0,0 +1,54 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 17:05
+from dataclasses import dataclass
+
+from app.handler.nacos_handler import NacosResource
+
+
+@dataclass
+class Server:
+    host: str
+    port: int
+
+
+class FakeClient:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def get_config(self, data_id, group="DEFAULT_GROUP"):
+        self.calls += 1
+        return self.content
+
+
+def test_nacos_resource_formats():
+    """测试 NacosResource 解析 YAML 与 JSON 配置，非字典内容返回空字典"""
+    assert NacosResource(FakeClient("a:\n  b: 1\n"), "app.yml").load() == {"a": {"b": 1}}
+    assert NacosResource(FakeClient(' {"a": {"b": [1, 2]}}\n'), "app.json").load() == {"a": {"b": [1, 2]}}
+    assert NacosResource(FakeClient("[1, 2]"), "list.json").load() == {}
+    # 以 { 开头但不是合法 JSON 时回退为 YAML 解析
+    assert NacosResource(FakeClient("{a: 1}"), "flow.yml").load() == {"a": 1}
+    assert NacosResource(FakeClient("a: [1"), "broken.yml").load() == {}
+    assert NacosResource(FakeClient(None), "missing").load() == {}
+    assert NacosResource(FakeClient(" \n"), "blank").load() == {}
+    assert NacosResource(FakeClient('\ufeff{"a": 1}'), "bom.json").load() == {"a": 1}
+
+
+def test_nacos_resource_reuses_parsed_content():
+    """测试配置内容未变化时复用解析结果，返回的字典互不影响"""
+    client = FakeClient("a:\n  b: 1\n")
+    resource = NacosResource(client, "app.yml")
+    first = resource.load()
+    first["a"]["b"] = 2
+    assert resource.load() == {"a": {"b": 1}}
+    client.content = "a:\n  b: 3\n"
+    assert resource.load() == {"a": {"b": 3}}
+    assert resource.latest_data == {"a": {"b": 3}}
+
+
+def test_nacos_resource_load_as():
+    """测试 load_as 将配置直接转换为 dataclass"""
+    resource = NacosResource(FakeClient('{"Host": "127.0.0.1", "port": "6379"}'), "redis.json")
+    assert resource.load_as(Server) == Server(host="127.0.0.1", port=6379)
+    assert resource.latest_data == {"Host": "127.0.0.1", "port": "6379"}
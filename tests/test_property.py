@@ -0,0 +1,124 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 10:45
+import pytest
+
+from app.core.property import PropertyDict
+
+
+@pytest.fixture
+def props():
+    return PropertyDict({
+        "log": {"level": "INFO", "path": None},
+        "nacos": {"server": {"namespace": "dev", "port": 8848}},
+        "name": "app",
+    })
+
+
+def test_getprop(props):
+    """测试点分路径取值"""
+    assert props.getprop("name") == "app"
+    assert props.getprop("log.level") == "INFO"
+    assert props.getprop("nacos.server.port") == 8848
+    assert props.getprop(" nacos . server . namespace ") == "dev"
+    assert props.getprop("nacos/server/port", delimiter="/") == 8848
+
+
+def test_getprop_default(props):
+    """测试路径不存在、值为 None、非法 key 时返回默认值"""
+    assert props.getprop("log.path", "logs/app.log") == "logs/app.log"
+    assert props.getprop("log.level.value", "x") == "x"
+    assert props.getprop("missing", 1) == 1
+    assert props.getprop("log..level", 2) == 2
+    assert props.getprop("", 3) == 3
+
+
+def test_getprop_raise_error(props):
+    """测试 raise_error=True 时抛出 KeyError"""
+    with pytest.raises(KeyError):
+        props.getprop("log.missing", raise_error=True)
+    with pytest.raises(KeyError):
+        props.getprop("name.value", raise_error=True)
+    with pytest.raises(KeyError):
+        props.getprop(".log", raise_error=True)
+
+
+def test_merge(props):
+    """测试递归合并及 None 的处理方式"""
+    props.merge({"log": {"level": "DEBUG", "path": "a.log"}, "name": None})
+    assert props.getprop("log.level") == "DEBUG"
+    assert props.getprop("log.path") == "a.log"
+    assert props.getprop("name") == "app"
+
+    props.merge({"log": {"path": None}}, none_mode="delete")
+    assert "path" not in props["log"]
+
+    props.merge({"name": None}, none_mode="override")
+    assert "name" in props and props["name"] is None
+
+
+def test_merge_nested():
+    """测试多层嵌套字典合并时保留未覆盖的键"""
+    props = PropertyDict({"a": {"b": {"c": 1, "d": 2}, "e": 3}})
+    props.merge({"a": {"b": {"c": 10, "f": {"g": 4}}}, "h": [1]})
+    assert props == {"a": {"b": {"c": 10, "d": 2, "f": {"g": 4}}, "e": 3}, "h": [1]}
+
+
+def test_getmany(props):
+    """测试按前缀获取整个子配置"""
+    assert props.getmany("nacos.server") == {"namespace": "dev", "port": 8848}
+    assert props.getmany("nacos.missing") == {}
+    assert props.getmany("name") == {}
+
+
+def test_getprop_tuple_key(props):
+    """测试使用已拆分好的路径元组取值"""
+    assert props.getprop(("nacos", "server", "port")) == 8848
+    assert props.getprop(("nacos", "missing"), 0) == 0
+    with pytest.raises(KeyError):
+        props.getprop(("log", ""), raise_error=True)
+
+
+def test_merge_copy_on_write():
+    """测试合并时不原地修改已发布的嵌套字典"""
+    props = PropertyDict({"a": {"b": 1}, "c": {"d": 2}})
+    published = props["a"]
+    override = {"a": {"e": 3}}
+    props.merge(override)
+    assert published == {"b": 1}
+    assert props["a"] == {"b": 1, "e": 3}
+
+    # 新增的嵌套字典直接引用 override 中的对象，后续合并时同样先复制
+    props.merge({"g": {"h": 1}})
+    props.merge({"a": {"f": 4}, "g": {"i": 2}})
+    assert override == {"a": {"e": 3}}
+    assert props == {"a": {"b": 1, "e": 3, "f": 4}, "c": {"d": 2}, "g": {"h": 1, "i": 2}}
+
+    props.merge({"c": None}, none_mode="delete")
+    assert "c" not in props
+
+
+def test_getprop_top_level(props):
+    """测试无分隔符的顶层 key 走快速路径，行为与路径取值一致"""
+    assert props.getprop(" name ") == "app"
+    assert props.getprop("log") == {"level": "INFO", "path": None}
+    assert props.getprop("missing", "x") == "x"
+    assert props.getprop("   ", "y") == "y"
+    with pytest.raises(KeyError):
+        props.getprop("missing", raise_error=True)
+
+
+def test_getprop_cache_invalidation(props):
+    """测试 getprop 缓存在合并、修改顶层键及手动失效后不返回旧值"""
+    assert props.getprop("log.level") == "INFO"
+    props.merge({"log": {"level": "DEBUG"}})
+    assert props.getprop("log.level") == "DEBUG"
+
+    assert props.getprop("nacos.server.port") == 8848
+    props["nacos"] = {"server": {"port": 9848}}
+    assert props.getprop("nacos.server.port") == 9848
+
+    assert props.getprop("log.extra", "x") == "x"
+    props["log"]["extra"] = 1
+    props.invalidate_cache()
+    assert props.getprop("log.extra") == 1
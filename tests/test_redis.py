@@ -0,0 +1,31 @@
+# @description: 
+# @author: licanglong
+# @date: 2026/10/15 18:20
+import pytest
+import redis
+
+from app.handler.redis_handler import RedisClient
+
+
+@pytest.fixture
+def fresh_client(monkeypatch):
+    """每个测试重新创建单例，测试结束后恢复原实例"""
+    monkeypatch.setattr(RedisClient, "_instance", None)
+
+
+def test_positional_connection_class(fresh_client):
+    """测试按 redis.ConnectionPool 的顺序传入位置参数，阻塞连接池同样生效"""
+    client = RedisClient(redis.Connection, host="localhost", port=6390)
+    pool = client.client.connection_pool
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.connection_class is redis.Connection
+    assert pool.max_connections == 32
+    assert pool.connection_kwargs["port"] == 6390
+
+
+def test_non_blocking_pool(fresh_client):
+    """测试 blocking=False 时使用普通连接池，第二个位置参数为最大连接数"""
+    client = RedisClient(redis.Connection, 5, blocking=False, host="localhost")
+    pool = client.client.connection_pool
+    assert type(pool) is redis.ConnectionPool
+    assert pool.max_connections == 5